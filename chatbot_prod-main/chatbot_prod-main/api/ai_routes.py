@@ -145,7 +145,7 @@ async def run_chat_analysis(conversation_id: str, user: CurrentUser, force: bool
                 last_analysis_time = last_analysis_time.replace(tzinfo=timezone.utc)
 
         if force or not last_analysis_time or ((datetime.now(timezone.utc) - last_analysis_time).total_seconds()/60 >= 10):
-            new_result = await analyze_and_update_conversation(org_id, conversation_id) 
+            new_result = await analyze_and_update_conversation(org_id, conversation_id, force=force) 
 
             if new_result is not None:
                 # Re-fetch contact to get updated tags/labels
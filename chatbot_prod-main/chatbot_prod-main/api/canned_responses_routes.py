@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from auth.dependencies import CurrentUser
 from fastapi import APIRouter, HTTPException
 from schemas.models import CannedResponse, CannedResponseOut, UpdateCannedResponseRequest
@@ -26,19 +26,21 @@ async def get_canned_responses(user: CurrentUser):
 
     return {"canned_responses": canned_responses}
 
-@router.post("")
-async def create_canned_response(user: CurrentUser, body: CannedResponse):
+@router.post("", response_model=CannedResponseOut)
+async def create_canned_response(user: CurrentUser, body: CannedResponse, response: Response):
     """
     Create a single canned respones for the organization.
+    Returns only the created record (not the full list) - clients append it to their local state.
     """
 
     org_id = user.org_id
     if not org_id:
         raise HTTPException(status_code=400, detail="Invalid organization ID")
     
-    canned_responses = await create_canned_response_for_org(org_id, body)
+    canned_response = await create_canned_response_for_org(org_id, body)
 
-    return {"canned_responses": canned_responses}
+    response.headers["ETag"] = f'"{canned_response["id"]}:{canned_response["updated_at"]}"'
+    return canned_response
 
 @router.delete("/{shortcut_id}")
 async def delete_canned_response(user: CurrentUser, shortcut_id: str):
@@ -5,7 +5,7 @@ from config.settings import APP_ID
 from services.cloudinary_service import upload_media_to_cloudinary
 import json
 from fastapi import APIRouter, HTTPException, Response, Query, File, UploadFile, Form, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from typing import Optional
 import httpx
 
@@ -15,6 +15,7 @@ from schemas.models import UnarchiveRequest, PrivateNoteRequest, UpdateCategorie
 from services.conversation_utils import reopen_conversation
 from services.common_service import (
     fetch_conversations_new, 
+    stream_conversations,
     fetch_conversation,
     send_message,
     fetch_messages,
@@ -69,7 +70,7 @@ async def health_check_head(response: Response):
 def favicon():
     return Response(status_code=204) 
 
-@router.get("/api/conversations")
+@router.get("/api/conversations", response_class=ORJSONResponse)
 async def get_conversations(
     user: CurrentUser,
     skip: int = Query(0, ge=0),
@@ -88,7 +89,8 @@ async def get_conversations(
         if not org_id:
             raise HTTPException(status_code=400, detail="Invalid organization ID")
 
-        return await fetch_conversations_new(
+        # Already in wire shape from the $project stage; hand it straight to orjson
+        return ORJSONResponse(await fetch_conversations_new(
             org_id=org_id,
             current_user_id=user.user_id,
             skip=skip,
@@ -98,7 +100,7 @@ async def get_conversations(
             unread_only=unread_only,
             platform=platform,
             priority=priority
-        )
+        ))
 
     except HTTPException:
         raise
@@ -106,7 +108,41 @@ async def get_conversations(
         logger.error(f"Error fetching conversations for {user.org_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch conversations")
 
-@router.get("/api/conversations/{conversation_id}")
+@router.get("/api/conversations/stream")
+async def stream_conversations_endpoint(
+    user: CurrentUser,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    search: Optional[str] = None,
+    active_tab: str = Query("all"),
+    unread_only: bool = Query(False),
+    platform: Optional[str] = None,
+    priority: Optional[str] = None
+):
+    """
+    Stream conversations for the current user's organization as NDJSON
+    (one conversation per line, same shape as GET /api/conversations)
+    """
+    org_id = user.org_id
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Invalid organization ID")
+
+    return StreamingResponse(
+        stream_conversations(
+            org_id=org_id,
+            current_user_id=user.user_id,
+            skip=skip,
+            limit=limit,
+            search=search,
+            active_tab=active_tab,
+            unread_only=unread_only,
+            platform=platform,
+            priority=priority
+        ),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/api/conversations/{conversation_id}", response_class=ORJSONResponse)
 async def get_conversation(conversation_id: str, user: CurrentUser):
     """
     Fetch the conversation of a specific user for the organization.
@@ -118,12 +154,12 @@ async def get_conversation(conversation_id: str, user: CurrentUser):
     
     try:
         conversation = await fetch_conversation(org_id, conversation_id)
-        return conversation
+        return ORJSONResponse(conversation)
     except HTTPException as e:
         logger.error(f"Error fetching conversation {conversation_id} for org {org_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch conversation")
 
-@router.get("/api/conversations/{conversation_id}/messages")
+@router.get("/api/conversations/{conversation_id}/messages", response_class=ORJSONResponse)
 async def get_messages(conversation_id: str, 
                        user: CurrentUser,
                        agent_username: str = Query(..., description="Username of the agent accessing this conversation")
@@ -133,7 +169,8 @@ async def get_messages(conversation_id: str,
     if not org_id:
         raise HTTPException(status_code=400, detail="Invalid organization ID")
     
-    return await fetch_messages(org_id, conversation_id, user.user_id, agent_username)
+    # Returned as a response object so FastAPI skips jsonable_encoder and orjson encodes the datetimes
+    return ORJSONResponse(await fetch_messages(org_id, conversation_id, user.user_id, agent_username))
 
 @router.post("/api/conversations/send-message")
 async def send_message_endpoint(
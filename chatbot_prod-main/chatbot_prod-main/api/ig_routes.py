@@ -4,6 +4,7 @@ from pymongo import ReturnDocument
 
 from config.settings import *
 from services.cloudinary_service import upload_media_to_cloudinary
+from services.common_service import invalidate_org_platform_ids
 from services.ig_service import *
 from schemas.models import PlatformDisconnectRequest, MessageRole
 from auth.dependencies import CurrentUser
@@ -13,6 +14,7 @@ from services.platforms.instagram_service import InstagramService
 from database import get_mongo_db
 from pymongo import ReturnDocument
 import cloudinary
+import requests
 
 from loguru import logger
 
@@ -244,6 +246,8 @@ async def instagram_auth(request: dict, user: CurrentUser):
             {"org_id": org_id},
             {"$set": {"ig_id": str(instagram_id)}}
         )
+        invalidate_org_platform_ids(org_id)
+        invalidate_page_token(str(instagram_id))
         
         return {
             "status": "success",
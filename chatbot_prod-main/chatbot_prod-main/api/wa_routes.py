@@ -25,6 +25,7 @@ from schemas.models import WhatsappAuthRequest, MessageRole, PlatformDisconnectR
 from services.wa_service import broadcast_whatsapp_message, store_whatsapp_message, send_whatsapp_message, get_templates, create_templates, create_bulk_job, run_bulk_send_job
 from services.platforms.whatsapp_service import WhatsAppService
 from services.cloudinary_service import check_cloudinary_storage_limit
+from services.common_service import invalidate_org_platform_ids
 from database import get_mongo_db
 from auth.dependencies import CurrentUser
 from auth.auth_utils import admin_required, require_auth
@@ -188,6 +189,7 @@ async def whatsapp_auth_exchange(request: WhatsappAuthRequest, user: CurrentUser
             {"org_id": org_id},
             {"$set": {"wa_id": str(whatsapp_business_id)}}
         )
+        invalidate_org_platform_ids(org_id)
         
         # Store connection in database
         whatsapp_connection = {
@@ -42,6 +42,7 @@ INSTAGRAM_APP_SECRET = os.getenv("IG_APP_SECRET")
 CLOUDINARY_CLOUD_NAME=os.getenv('CLOUDINARY_CLOUD_NAME')
 CLOUDINARY_API_KEY=os.getenv('CLOUDINARY_API_KEY')
 CLOUDINARY_API_SECRET=os.getenv('CLOUDINARY_API_SECRET')
+CLOUDINARY_URL=os.getenv('CLOUDINARY_URL')
 
 # Firestore
 SERVICE_ACCOUNT_FILE = os.getenv('FIRESTORE_SERVICE_ACCOUNT_FILE')
@@ -71,4 +72,19 @@ CASHFREE_SECRET_KEY = os.getenv("CASHFREE_SECRET_KEY")
 CASHFREE_VERSION = os.getenv("CASHFREE_VERSION")
 
 #Clerk
-CLERK_TOKEN = os.getenv("CLERK_TOKEN_KEY")
\ No newline at end of file
+CLERK_TOKEN = os.getenv("CLERK_TOKEN_KEY")
+
+# HeidelAI chatbot: /chat micro-batching window and size. Off (0) by default; only set
+# a window once the chatbot exposes /chat/batch, since every query waits out the window
+CHATBOT_BATCH_MS = int(os.getenv("CHATBOT_BATCH_MS", "0"))
+CHATBOT_BATCH_MAX = int(os.getenv("CHATBOT_BATCH_MAX", "8"))
+
+# Max simultaneous in-flight requests to the chatbot; excess requests wait their turn
+CHATBOT_MAX_INFLIGHT = int(os.getenv("CHATBOT_MAX_INFLIGHT", "64"))
+
+# Opt-in semantic reply cache (embeds queries via the KOYEB2 /encode service)
+CHATBOT_SEMANTIC_CACHE = os.getenv("CHATBOT_SEMANTIC_CACHE") == "1"
+
+# Opt-in daily job that permanently DELETES Cloudinary media older than 30 days.
+# Every worker runs its own scheduler, so enable this on a single worker/instance only.
+CLOUDINARY_CLEANUP_ENABLED = os.getenv("CLOUDINARY_CLEANUP_ENABLED") == "1"
\ No newline at end of file
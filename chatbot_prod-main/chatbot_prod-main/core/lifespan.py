@@ -1,8 +1,16 @@
+import asyncio
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from core.scheduler import start_scheduler
+from database import ensure_indexes
 from services.ai_chatbot import load_agents, clear_agents, load_prompts_into_cache
 from services.automation_scheduler import startup_scheduler, shutdown_scheduler
+from services.clerk_service import close_clerk_client
+from config.settings import CLOUDINARY_CLEANUP_ENABLED
+from services.cloudinary_service import schedule_cleanup_tasks, shutdown_cleanup_tasks, close_cloudinary_clients
+from services.common_service import flush_private_notes
+from services.heidelai_bot import close_chatbot_client
+from services.ig_service import close_ig_client
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -10,11 +18,22 @@ async def lifespan(app: FastAPI):
     Lifespan event for the FastAPI application.
     """
     # Startup
+    # Index builds can take a while on large orgs; run them without holding up startup
+    index_task = asyncio.create_task(ensure_indexes())
     load_agents()
     load_prompts_into_cache()
     start_scheduler()
+    if CLOUDINARY_CLEANUP_ENABLED:
+        await schedule_cleanup_tasks()
     await startup_scheduler()
     yield
     # Shutdown
+    index_task.cancel()
+    await flush_private_notes()
     await shutdown_scheduler()
+    await shutdown_cleanup_tasks()
+    await close_clerk_client()
+    await close_chatbot_client()
+    await close_cloudinary_clients()
+    await close_ig_client()
     clear_agents()
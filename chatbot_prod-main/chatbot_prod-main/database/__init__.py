@@ -1,6 +1,7 @@
 from pinecone import Pinecone
 from pymongo import MongoClient
 from motor.motor_asyncio import AsyncIOMotorClient
+from loguru import logger
 from config.settings import MONGODB_URI, MONGODB_CLUSTER, PINECONE_API_KEY, PINECONE_INDEX_NAME
 
 _client = None
@@ -41,4 +42,66 @@ def get_pinecone_db():
     if _pinecone_index is None:
         pc = Pinecone(api_key=PINECONE_API_KEY)
         _pinecone_index = pc.Index(PINECONE_INDEX_NAME)
-    return _pinecone_index
\ No newline at end of file
+    return _pinecone_index
+
+async def _create_index(collection, keys, **kwargs):
+    """create_index that logs and swallows its own failure, so one bad index (e.g. a
+    unique index over existing duplicates) doesn't stop the rest from being created."""
+    try:
+        await collection.create_index(keys, **kwargs)
+    except Exception as e:
+        logger.error(f"Error creating index {keys} on {collection.name}: {e}")
+
+async def ensure_org_indexes(org_id: str):
+    """
+    Create the indexes for one org's message / conversation collections. Called for
+    every org by ensure_indexes() and for new orgs from create_organization().
+    """
+    if not org_id:
+        return
+    db = get_async_mongo_db()
+    await _create_index(db[f"messages_{org_id}"], [("conversation_id", 1), ("timestamp", 1)])
+    await _create_index(db[f"private_notes_{org_id}"], [("conversation_id", 1), ("timestamp", 1)])
+    await _create_index(db[f"conversations_{org_id}"], "conversation_id", unique=True)
+    await _create_index(db[f"conversations_{org_id}"], [("last_message_timestamp", -1)])
+    # store_contact / bulk contact upload upsert on these
+    await _create_index(db[f"contacts_{org_id}"], "phone_number", sparse=True)
+    await _create_index(db[f"contacts_{org_id}"], "instagram_id", sparse=True)
+
+async def ensure_indexes():
+    """
+    Create the indexes the hot read paths rely on. Started as a background task from
+    lifespan.py so startup doesn't wait on it; create_index is a no-op when the index
+    already exists.
+    """
+    db = get_async_mongo_db()
+
+    # Canned responses: per-org listing + duplicate shortcut detection (DuplicateKeyError)
+    await _create_index(db.canned_responses, [("org_id", 1), ("shortcut", 1)], unique=True)
+
+    # Automation triggers: _find_matching_triggers lookup on every inbound event
+    await _create_index(
+        db.automation_triggers,
+        [("org_id", 1), ("status", 1), ("trigger_type", 1), ("platform", 1)],
+        name="trigger_match_idx",
+    )
+
+    # Instagram page token lookup: find_one(instagram_id, is_active) sorted by
+    # last_updated desc is served by an index scan with no in-memory SORT stage
+    await _create_index(
+        db.instagram_connections,
+        [("instagram_id", 1), ("is_active", 1), ("last_updated", -1)],
+        name="ig_conn_token_lookup",
+    )
+
+    # Per-org message / conversation collections
+    try:
+        org_ids = await db.organizations.distinct("org_id")
+    except Exception as e:
+        logger.error(f"Error listing organizations for index creation: {e}")
+        return
+
+    for org_id in org_ids:
+        await ensure_org_indexes(org_id)
+
+    logger.info("Core MongoDB indexes ensured.")
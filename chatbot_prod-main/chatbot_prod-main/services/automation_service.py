@@ -321,6 +321,9 @@ async def _deactivate_flow_triggers(org_id: str, flow_id: str):
     )
     logger.info(f"Deactivated {result.modified_count} triggers for flow {flow_id}")
 
+    from services.automation_trigger_handler import invalidate_trigger_cache
+    invalidate_trigger_cache(org_id)
+
 
 # =============================================================================
 # EXECUTION COUNT
@@ -471,7 +474,6 @@ async def _handle_google_sheet_trigger(
         "start_node_id": start_node_id,
         "status": "active",
         "registered_at": datetime.now(timezone.utc),
-        "last_triggered_at": None,
     }
 
     triggers_collection.update_one(
@@ -515,6 +517,8 @@ async def _register_single_trigger(
 
     filters = {
         "keyword": keyword_value,
+        # Lowercased once here so the inbound-event matcher doesn't redo it per message
+        "keyword_lower": keyword_value.lower(),
         "post_id": config.get("post_id"),
         "story_id": config.get("story_id"),
         "tag": config.get("tag"),
@@ -530,7 +534,6 @@ async def _register_single_trigger(
         "start_node_id": start_node_id,
         "status": "active",
         "registered_at": datetime.now(timezone.utc),
-        "last_triggered_at": None,
     }
 
     triggers_collection.update_one(
@@ -540,6 +543,9 @@ async def _register_single_trigger(
     )
     logger.info(f"Registered trigger: {trigger_type} for flow {flow_id}")
 
+    from services.automation_trigger_handler import invalidate_trigger_cache
+    invalidate_trigger_cache(org_id)
+
 
 async def _register_flow_triggers(org_id: str, flow_id: str, flow_data: Dict):
     """
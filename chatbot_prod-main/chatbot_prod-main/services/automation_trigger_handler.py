@@ -1,7 +1,9 @@
 # === Third-party Modules ===
 import asyncio
+import time
 from typing import Dict, Optional
 from datetime import datetime, timezone
+from pymongo import UpdateOne
 
 # === Internal Modules ===
 from database import get_mongo_db
@@ -11,6 +13,21 @@ from loguru import logger
 
 db = get_mongo_db()
 
+TRIGGER_LAST_FIRED_COLLECTION = "trigger_last_fired"
+
+# Strong references to in-flight flow executions so they aren't garbage-collected mid-run
+_BG_TASKS: set[asyncio.Task] = set()
+
+# Active triggers per (org_id, platform, trigger_type) -> (fetched_at, [(trigger, predicates)]).
+# Triggers only change on flow publish/unpublish, which call invalidate_trigger_cache().
+TRIGGER_CACHE_TTL_SECONDS = 60
+_TRIGGER_CACHE: Dict[tuple, tuple[float, list]] = {}
+
+# Per-org event queues feeding _trigger_batch_consumer; a consumer with nothing to do
+# for TRIGGER_CONSUMER_IDLE_SECONDS exits and drops its queue
+TRIGGER_BATCH_MAX_EVENTS = 32
+TRIGGER_CONSUMER_IDLE_SECONDS = 60
+_EVENT_QUEUES: Dict[str, asyncio.Queue] = {}
 
 # === Helper Functions for Collection Access ===
 def _automation_triggers_collection():
@@ -50,12 +67,13 @@ async def check_and_trigger_automations(
         logger.info(f"Found {len(triggers)} matching triggers for {platform} {event_type} in org {org_id}")
         
         # Execute each matching flow
+        fired_trigger_ids = []
         for trigger in triggers:
             flow_id = trigger.get("flow_id")
             
             try:
                 # Execute flow asynchronously (in production, use Celery)
-                asyncio.create_task(
+                task = asyncio.create_task(
                     execute_automation_flow(
                         org_id=org_id,
                         flow_id=flow_id,
@@ -63,13 +81,17 @@ async def check_and_trigger_automations(
                         trigger_data=trigger_data
                     )
                 )
+                _BG_TASKS.add(task)
+                task.add_done_callback(_BG_TASKS.discard)
                 
-                # Update last_triggered_at
-                await _update_trigger_timestamp(trigger.get("trigger_id"))
+                fired_trigger_ids.append(trigger.get("trigger_id"))
                 
             except Exception as e:
                 logger.error(f"Error executing flow {flow_id}: {str(e)}")
         
+        # Update last-fired timestamps in one round-trip
+        await _record_triggers_fired(org_id, fired_trigger_ids)
+        
     except Exception as e:
         logger.error(f"Error in check_and_trigger_automations: {str(e)}")
 
@@ -83,38 +105,135 @@ async def _find_matching_triggers(
     """
     Find all triggers that match the given event
     
+    Events whose trigger list is already cached are matched immediately. The rest go
+    through _trigger_batch_consumer, which refreshes the cache for every event queued
+    for the org with one query, so a burst costs at most one trigger query.
+    
     Returns:
         List of matching trigger documents
     """
-    triggers_collection = _automation_triggers_collection()
-    
-    # Map event_type to trigger_type
     trigger_type = _event_to_trigger_type(event_type, platform)
+    cached = _TRIGGER_CACHE.get((org_id, platform, trigger_type))
+    if cached and time.monotonic() - cached[0] < TRIGGER_CACHE_TTL_SECONDS:
+        return _match_cached_triggers(org_id, platform, trigger_type, trigger_data)
+    
+    queue = _EVENT_QUEUES.get(org_id)
+    if queue is None:
+        queue = _EVENT_QUEUES[org_id] = asyncio.Queue()
+        consumer = asyncio.create_task(_trigger_batch_consumer(org_id, queue))
+        _BG_TASKS.add(consumer)
+        consumer.add_done_callback(_BG_TASKS.discard)
+    
+    future = asyncio.get_running_loop().create_future()
+    queue.put_nowait((platform, event_type, trigger_data, future))
+    return await future
+
+
+async def _trigger_batch_consumer(org_id: str, queue: asyncio.Queue):
+    """
+    Per-org background consumer: takes up to TRIGGER_BATCH_MAX_EVENTS queued events
+    (without waiting for more to arrive), refreshes the trigger cache for all of them
+    with one query, then resolves each waiter with its matches. Events that arrive
+    while the query runs are picked up together on the next pass.
+    """
+    while True:
+        try:
+            batch = [await asyncio.wait_for(queue.get(), TRIGGER_CONSUMER_IDLE_SECONDS)]
+        except asyncio.TimeoutError:
+            # No await between this check and _find_matching_triggers' put, so nothing
+            # can be enqueued on a queue that has already been dropped
+            if queue.empty():
+                if _EVENT_QUEUES.get(org_id) is queue:
+                    del _EVENT_QUEUES[org_id]
+                return
+            continue
+        
+        while len(batch) < TRIGGER_BATCH_MAX_EVENTS and not queue.empty():
+            batch.append(queue.get_nowait())
+        
+        try:
+            keys = {
+                (platform, _event_to_trigger_type(event_type, platform))
+                for platform, event_type, _, _ in batch
+            }
+            await _refresh_trigger_cache(org_id, keys)
+        except Exception as e:
+            logger.error(f"Error loading triggers for org {org_id}: {str(e)}")
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        
+        # Match each event on its own so one bad trigger_data doesn't fail the others
+        for platform, event_type, trigger_data, future in batch:
+            if future.done():
+                continue
+            try:
+                trigger_type = _event_to_trigger_type(event_type, platform)
+                future.set_result(_match_cached_triggers(org_id, platform, trigger_type, trigger_data))
+            except Exception as e:
+                logger.error(f"Error matching triggers for org {org_id}: {str(e)}")
+                future.set_exception(e)
+
+
+async def _refresh_trigger_cache(org_id: str, keys: set):
+    """
+    Reload stale (platform, trigger_type) cache entries for an org in a single query
+    """
+    now = time.monotonic()
+    stale_keys = [
+        (platform, trigger_type)
+        for platform, trigger_type in keys
+        if not (
+            (cached := _TRIGGER_CACHE.get((org_id, platform, trigger_type)))
+            and now - cached[0] < TRIGGER_CACHE_TTL_SECONDS
+        )
+    ]
+    if not stale_keys:
+        return
     
-    # Query for matching triggers
+    # Add platform filter only where applicable
     query = {
         "org_id": org_id,
         "status": "active",
-        "trigger_type": trigger_type
+        "$or": [
+            {"trigger_type": trigger_type, "platform": platform} if platform else {"trigger_type": trigger_type}
+            for platform, trigger_type in stale_keys
+        ]
     }
+    # Sync PyMongo client; keep the query off the event loop
+    triggers = await asyncio.to_thread(lambda: list(_automation_triggers_collection().find(query)))
     
-    # Add platform filter if applicable
-    if platform:
-        query["platform"] = platform
-    
-    # Find all potential triggers
-    triggers = list(triggers_collection.find(query))
+    for platform, trigger_type in stale_keys:
+        _TRIGGER_CACHE[(org_id, platform, trigger_type)] = (now, [
+            (trigger, _compile_trigger_predicates(trigger))
+            for trigger in triggers
+            if trigger.get("trigger_type") == trigger_type and (not platform or trigger.get("platform") == platform)
+        ])
+
+
+def _match_cached_triggers(org_id: str, platform: str, trigger_type: str, trigger_data: Dict) -> list:
+    """Filter the cached triggers for one event by their compiled criteria"""
+    _, compiled_triggers = _TRIGGER_CACHE[(org_id, platform, trigger_type)]
     
-    # Filter triggers based on additional criteria
     matching_triggers = []
+    message_text_lower = trigger_data.get("message_text", "").lower()
     
-    for trigger in triggers:
-        if _trigger_matches_criteria(trigger, trigger_data):
+    for trigger, predicates in compiled_triggers:
+        if _trigger_matches_criteria(predicates, trigger_data, message_text_lower):
             matching_triggers.append(trigger)
+        else:
+            logger.debug(f"❌ Trigger {trigger.get('trigger_id')} criteria not matched")
     
     return matching_triggers
 
 
+def invalidate_trigger_cache(org_id: str):
+    """Drop all cached trigger lists for an organization (call after trigger CRUD)."""
+    for key in [k for k in _TRIGGER_CACHE if k[0] == org_id]:
+        _TRIGGER_CACHE.pop(key, None)
+
+
 def _event_to_trigger_type(event_type: str, platform: str) -> str:
     """Map event type to trigger type"""
     event_map = {
@@ -129,68 +248,65 @@ def _event_to_trigger_type(event_type: str, platform: str) -> str:
     return event_map.get(event_type, event_type)
 
 
-def _trigger_matches_criteria(trigger: Dict, trigger_data: Dict) -> bool:
+def _compile_trigger_predicates(trigger: Dict) -> list:
     """
-    Check if trigger matches additional criteria (keyword, post_id, etc)
+    Build the filter predicates for a trigger once, when the trigger list is loaded,
+    so the per-event check only runs the filters this trigger actually uses.
     
-    Returns:
-        True if trigger matches, False otherwise
+    Each predicate is called as predicate(trigger_data, message_text_lower).
     """
-    filters = trigger.get("filters", {})
+    filters = trigger.get("filters") or {}
+    predicates = []
     
-    # Check keyword filter (supports pipe-separated keywords: "price|info|help")
-    keyword_filter = filters.get("keyword", "")
-    if keyword_filter:
-        message_text = trigger_data.get("message_text", "").lower()
-        
-        # Split by pipe and check if ANY keyword matches
-        keywords = [k.strip().lower() for k in keyword_filter.split("|") if k.strip()]
-        
-        if keywords:
-            # Check if ANY keyword is in the message
-            keyword_found = any(keyword in message_text for keyword in keywords)
-            
-            if not keyword_found:
-                logger.debug(f"❌ Keyword match failed. Looking for: {keywords}, Got: '{message_text}'")
-                return False
-            else:
-                logger.success(f"✅ Keyword matched! Found one of {keywords} in '{message_text}'")
+    # Keyword filter (supports pipe-separated keywords: "price|info|help")
+    # keyword_lower is stored at registration time; older triggers only have keyword
+    keyword_filter = filters.get("keyword_lower") or (filters.get("keyword") or "").lower()
+    keywords = tuple(k.strip() for k in keyword_filter.split("|") if k.strip())
+    if keywords:
+        predicates.append(lambda data, text, kws=keywords: any(kw in text for kw in kws))
     
-    # Check post_id filter (CRITICAL for Instagram comments)
-    post_id = filters.get("post_id")
-    if post_id:
-        trigger_post_id = trigger_data.get("post_id")
-        if trigger_post_id != post_id:
-            logger.debug(f"❌ Post ID mismatch. Expected: {post_id}, Got: {trigger_post_id}")
-            return False
-        else:
-            logger.success(f"✅ Post ID matched: {post_id}")
+    # Exact-match filters (post_id is CRITICAL for Instagram comments)
+    for field in ("post_id", "story_id", "tag"):
+        expected = filters.get(field)
+        if expected:
+            predicates.append(lambda data, text, f=field, v=expected: data.get(f) == v)
     
-    # Check story_id filter
-    story_id = filters.get("story_id")
-    if story_id:
-        if trigger_data.get("story_id") != story_id:
-            logger.debug(f"❌ Story ID mismatch")
-            return False
+    return predicates
+
+
+def _trigger_matches_criteria(predicates: list, trigger_data: Dict, message_text_lower: str) -> bool:
+    """
+    Check if a trigger's compiled predicates all match the event
     
-    # Check tag filter
-    tag = filters.get("tag")
-    if tag:
-        if trigger_data.get("tag") != tag:
-            logger.debug(f"❌ Tag mismatch")
-            return False
+    Args:
+        predicates: Output of _compile_trigger_predicates for the trigger
+        message_text_lower: Pre-lowercased message text, computed once per event by the caller
     
-    logger.success(f"✅ All trigger criteria matched!")
-    return True
+    Returns:
+        True if trigger matches, False otherwise
+    """
+    return all(predicate(trigger_data, message_text_lower) for predicate in predicates)
 
 
-async def _update_trigger_timestamp(trigger_id: str):
-    """Update last_triggered_at timestamp for a trigger"""
-    triggers_collection = _automation_triggers_collection()
+async def _record_triggers_fired(org_id: str, trigger_ids: list):
+    """
+    Record last-fired timestamps in the separate trigger_last_fired collection so the
+    automation_triggers documents read on every event stay small and read-only
+    """
+    if not trigger_ids:
+        return
     
-    triggers_collection.update_one(
-        {"trigger_id": trigger_id},
-        {"$set": {"last_triggered_at": datetime.now(timezone.utc)}}
+    now = datetime.now(timezone.utc)
+    db[TRIGGER_LAST_FIRED_COLLECTION].bulk_write(
+        [
+            UpdateOne(
+                {"_id": f"{org_id}:{trigger_id}"},
+                {"$set": {"org_id": org_id, "trigger_id": trigger_id, "ts": now}},
+                upsert=True
+            )
+            for trigger_id in trigger_ids
+        ],
+        ordered=False
     )
 
 
@@ -208,7 +324,10 @@ async def trigger_tag_automation(org_id: str, conversation_id: str, tag: str, ac
     try:
         # Get conversation details
         conversations_collection = _conversations_collection(org_id)
-        conversation = conversations_collection.find_one({"conversation_id": conversation_id})
+        conversation = conversations_collection.find_one(
+            {"conversation_id": conversation_id},
+            {"customer_id": 1, "customer_name": 1, "platform": 1, "_id": 0}
+        )
         
         if not conversation:
             logger.warning(f"Conversation {conversation_id} not found")
@@ -7,9 +7,10 @@ from fastapi import HTTPException, status
 from bson.errors import InvalidId
 from schemas.models import CannedResponse
 
-from database import get_mongo_db
+from database import get_mongo_db, get_async_mongo_db
 
 db = get_mongo_db()
+async_db = get_async_mongo_db()
 
 
 async def get_canned_responses_for_org(org_id):
@@ -17,18 +18,13 @@ async def get_canned_responses_for_org(org_id):
     Retrieves canned responess of an organization 
     """
 
-    collection = db["canned_responses"]
+    collection = async_db["canned_responses"]
 
-    canned_responses = list(collection.find(
-        {"org_id": org_id}))
-
-    canned_responses = [serialize_mongo(cr) for cr in canned_responses]
-
-    return canned_responses
+    return [serialize_mongo(cr) async for cr in collection.find({"org_id": org_id})]
 
 async def create_canned_response_for_org(org_id: str, data: CannedResponse):
     """
-    Creates a canned response for an organization.
+    Creates a canned response for an organization and returns the created record.
     Args:
         org_id (str): The organization ID.
         data (CannedResponse): 
@@ -55,18 +51,18 @@ async def create_canned_response_for_org(org_id: str, data: CannedResponse):
     }
     
     try:
-        canned_responses_col.insert_one(document)
+        result = canned_responses_col.insert_one(document)
     except DuplicateKeyError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Canned response with shortcut {shortcut} already exists",
         )
 
-    canned_responses = list(
-        canned_responses_col.find({"org_id": org_id})
-    )
+    # Only the new record is returned; clients merge it into their local list
+    # instead of us re-reading every canned response for the org.
+    document["_id"] = result.inserted_id
 
-    return [serialize_mongo(cr) for cr in canned_responses]
+    return serialize_mongo(document)
     
 async def delete_canned_response_for_org(org_id: str, shortcut_id: str):
     """
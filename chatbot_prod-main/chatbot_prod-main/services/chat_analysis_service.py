@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timezone
 from pymongo.errors import PyMongoError
 
@@ -10,7 +11,7 @@ from loguru import logger
 
 db = get_mongo_db()
 
-async def analyze_and_update_conversation(org_id: str, conversation_id: str) -> ChatAnalysis:
+async def analyze_and_update_conversation(org_id: str, conversation_id: str, force: bool = False) -> ChatAnalysis:
     """
     Fetches the latest 40 messages for a given conversation_id,
     analyzes the conversation, and updates the conversation document
@@ -19,6 +20,7 @@ async def analyze_and_update_conversation(org_id: str, conversation_id: str) ->
     Args:
         org_id (str): The organization ID.
         conversation_id (str): The unique ID of the conversation.
+        force (bool): Re-run the analysis even if nothing has changed since the last one.
     """
 
     result_data = ChatAnalysis(
@@ -38,9 +40,16 @@ async def analyze_and_update_conversation(org_id: str, conversation_id: str) ->
 
         # ---- Fetch messages ----
         try:
+            # Bounded count first so short/new conversations skip the 40-message fetch
+            if messages_collection.count_documents({"conversation_id": conversation_id}, limit=5) < 5:
+                return result_data
+
             messages = (
                 list(
-                    messages_collection.find({"conversation_id": conversation_id})
+                    messages_collection.find(
+                        {"conversation_id": conversation_id},
+                        projection={"content": 1}
+                    )
                     .sort("timestamp", 1)
                     .limit(40)
                 )
@@ -51,14 +60,36 @@ async def analyze_and_update_conversation(org_id: str, conversation_id: str) ->
         if not messages or len(messages) < 5:
             return result_data
 
-        # Combine message content into a single string
-        conversation_text = "\n".join([msg["content"] for msg in messages])
-
         # Fetch existing tags and labels from org metadata
         available_tags = await contacts_service.get_tags_from_org_metadata(org_id)
         available_labels = await contacts_service.get_labels_from_org_metadata(org_id)
         # logger.info(f"Available tags: {available_tags}, Available labels: {available_labels}")
 
+        # Skip the LLM call when neither the messages nor the org's tags/labels have
+        # changed since the last analysis
+        sig = hashlib.blake2b(digest_size=16)
+        for msg in messages:
+            sig.update(str(msg["_id"]).encode() + b"\0")
+        sig.update(b"\1".join(tag.encode() for tag in sorted(map(str, available_tags))))
+        sig.update(b"\2")
+        sig.update(b"\1".join(label.encode() for label in sorted(map(str, available_labels))))
+        analysis_sig = sig.hexdigest()
+
+        conversation = None if force else conversations_collection.find_one(
+            {"conversation_id": conversation_id},
+            {"_id": 0, "analysis_sig": 1, "summary": 1, "priority": 1, "sentiment": 1, "suggestions": 1, "last_analyzed": 1},
+        )
+        if conversation and conversation.get("analysis_sig") == analysis_sig:
+            result_data.summary = conversation.get("summary") or []
+            result_data.priority = conversation.get("priority")
+            result_data.sentiment = conversation.get("sentiment")
+            result_data.suggestions = conversation.get("suggestions") or []
+            result_data.last_analyzed = conversation.get("last_analyzed")
+            return result_data
+
+        # Combine message content into a single string
+        conversation_text = "\n".join(msg["content"] for msg in messages)
+
         # Call LLM to analyze (constrained to existing tags/labels)
         analysis_result = await analyze_conversation(conversation_text, available_tags, available_labels)
         logger.info(f"Analysis result: {analysis_result}")
@@ -73,6 +104,7 @@ async def analyze_and_update_conversation(org_id: str, conversation_id: str) ->
                 "sentiment": analysis_result.sentiment,
                 "suggestions": analysis_result.suggestions,
                 "last_analyzed": timestamp,
+                "analysis_sig": analysis_sig,
             }
 
             conversations_collection.update_one(
@@ -1,13 +1,18 @@
 import uuid
 import time
+import functools
+import asyncio
+import heapq
 import re
+import orjson
 from bson import ObjectId
+from cachetools import TTLCache
 from typing import Optional, List, Dict
 from fastapi import HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorCollection
 from pymongo.collection import Collection
-from pymongo.errors import PyMongoError
-from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError, BulkWriteError
+from pymongo import ReturnDocument, UpdateOne
 from datetime import datetime, timezone, timedelta
 from core.services import services
 from services.wa_service import send_whatsapp_message, upload_and_send_wa_media_message, send_whatsapp_template_message
@@ -23,33 +28,104 @@ from loguru import logger
 
 db = get_mongo_db()
 
-async def fetch_conversations_new(
-    org_id: str, 
-    current_user_id: Optional[str] = None, 
-    skip: int = 0, 
-    limit: int = 50,
-    search: Optional[str] = None,
-    active_tab: str = "all",
-    unread_only: bool = False,
-    platform: Optional[str] = None,
-    priority: Optional[str] = None
-) -> List[Dict]:
-    start_time = time.time()
-    async_db = get_async_mongo_db()
-    collection = async_db[f"conversations_{org_id}"]
-
-    projection = {
-        "whatsapp_id": 0,
-        "instagram_id": 0,
-        "last_sender": 0,
-        "message_counter": 0,
-        "next_action_at": 0,
-        "reminder_stage": 0,
-        "started_at": 0,
-        "last_analyzed": 0,
-        "_id": 0,
+_HEX24 = re.compile(r"^[0-9a-fA-F]{24}$")
+
+
+@functools.lru_cache(maxsize=2048)
+def _org_collection(name: str, org_id: str, use_async: bool = True):
+    """
+    Cached handle for a per-org collection, e.g. _org_collection("messages", org_id)
+    -> messages_{org_id}. Async (Motor) by default; use_async=False for the sync client.
+    """
+    return (get_async_mongo_db() if use_async else db)[f"{name}_{org_id}"]
+
+
+# org_id -> {"wa_id", "ig_id"} for send_message; cleared by invalidate_org_platform_ids()
+# whenever a WhatsApp/Instagram account is connected or disconnected
+_org_platform_ids_cache = TTLCache(maxsize=1024, ttl=300)
+
+# IG conversation_id -> customer_id (fixed for the lifetime of a conversation)
+_ig_recipient_cache = TTLCache(maxsize=4096, ttl=60)
+
+# Per-org private note queues feeding _private_note_writer; a writer with nothing to
+# do for PRIVATE_NOTE_WRITER_IDLE_SECONDS exits and drops its queue
+PRIVATE_NOTE_BATCH_WINDOW_SECONDS = 0.05
+PRIVATE_NOTE_BATCH_MAX = 20
+PRIVATE_NOTE_WRITER_IDLE_SECONDS = 60
+_PRIVATE_NOTE_QUEUES: Dict[str, asyncio.Queue] = {}
+
+# Strong references to the background writer tasks
+_BG_TASKS: set[asyncio.Task] = set()
+
+
+def _get_org_platform_ids(org_id: str) -> dict:
+    """Connected WhatsApp/Instagram account ids for an org, cached for 5 minutes"""
+    ids = _org_platform_ids_cache.get(org_id)
+    if ids is None:
+        ids = db.organizations.find_one({"org_id": org_id}, {"wa_id": 1, "ig_id": 1, "_id": 0}) or {}
+        _org_platform_ids_cache[org_id] = ids
+    return ids
+
+
+def invalidate_org_platform_ids(org_id: str):
+    """Drop the cached wa_id/ig_id for an organization (call after changing them)."""
+    _org_platform_ids_cache.pop(org_id, None)
+
+
+def _iso_date_expr(field: str) -> dict:
+    """$project expression formatting a date field like datetime.isoformat(); None for non-dates"""
+    return {
+        "$cond": [
+            {"$eq": [{"$type": f"${field}"}, "date"]},
+            {"$dateToString": {"date": f"${field}", "format": "%Y-%m-%dT%H:%M:%S.%L"}},
+            None
+        ]
     }
 
+
+def _name_or_expr(fallback) -> dict:
+    """$project expression for customer_name, falling back when it is missing or empty"""
+    return {"$cond": [{"$ne": [{"$ifNull": ["$customer_name", ""]}, ""]}, "$customer_name", fallback]}
+
+
+# Conversation list item as returned by fetch_conversations_new (team chats are
+# finished off in Python from the extra team_name / participants / unread fields)
+_CONVERSATION_LIST_PROJECTION = {
+    "_id": 0,
+    "id": "$conversation_id",
+    "platform": {"$ifNull": ["$platform", None]},
+    "type": {"$ifNull": ["$type", None]},
+    "customer_id": {"$ifNull": ["$customer_username", None]},
+    "phone_number": {"$cond": [{"$eq": ["$platform", "whatsapp"]}, {"$ifNull": ["$customer_id", None]}, None]},
+    "customer_name": _name_or_expr("Unknown"),
+    "team_name": _name_or_expr("$conversation_id"),
+    "last_message": {"$ifNull": ["$last_message", ""]},
+    "last_message_is_private_note": {"$ifNull": ["$last_message_is_private_note", False]},
+    "timestamp": _iso_date_expr("last_message_timestamp"),
+    "unread_count": {"$ifNull": ["$unread_count", 0]},
+    "status": {"$ifNull": ["$status", None]},
+    "priority": {"$ifNull": ["$priority", None]},
+    "sentiment": {"$ifNull": ["$sentiment", None]},
+    "assigned_agent": {"$cond": [{"$eq": [{"$type": "$assigned_agent"}, "missing"]}, {"$literal": {}}, "$assigned_agent"]},
+    "is_ai_enabled": {"$ifNull": ["$is_ai_enabled", None]},
+    "reply_window_ends_at": _iso_date_expr("reply_window_ends_at"),
+    "assignment_history": {"$ifNull": ["$assignment_history", []]},
+    "suggestions": {"$ifNull": ["$suggestions", []]},
+    "summary": {"$ifNull": ["$summary", []]},
+    "participants": {"$ifNull": ["$participants", []]},
+    "unread": {"$ifNull": ["$unread", {"$literal": {}}]}
+}
+
+
+def _conversation_list_query(
+    current_user_id: Optional[str],
+    search: Optional[str],
+    active_tab: str,
+    unread_only: bool,
+    platform: Optional[str],
+    priority: Optional[str]
+) -> dict:
+    """Build the conversation list filter shared by fetch_conversations_new and stream_conversations"""
     # Filtering logic for Team Chat
     # 1. Customer conversations: type != "team"
     # 2. Team conversations: type == "team" AND current_user_id in participants
@@ -102,14 +178,65 @@ async def fetch_conversations_new(
 
     # Final query
     query = {"$and": base_conditions} if base_conditions else {}
+    return query
 
-    cursor = (
-        collection
-        .find(query, projection)
-        .sort("last_message_timestamp", -1)
-        .skip(skip)   # <-- Added skip
-        .limit(limit) # <-- Added limit
+
+def _finish_conversation_item(doc: dict, current_user_id: Optional[str]) -> dict:
+    """
+    Final touch on a _CONVERSATION_LIST_PROJECTION document. Team chats depend on the
+    caller (their unread counter) and on live agent connections (is_online), so
+    only those are reshaped here.
+    """
+    team_name = doc.pop("team_name", None)
+    if doc.get("type") != "team":
+        return doc
+
+    participants = doc.get("participants", [])
+    is_online = any(
+        services.agent_clients.get(p_id)
+        for p_id in participants
+        if p_id != current_user_id
     )
+    user_unread = doc.get("unread", {}).get(current_user_id, 0) if current_user_id else 0
+
+    return {
+        "id": doc.get("id"),
+        "customer_name": team_name,
+        "last_message": doc.get("last_message", ""),
+        "timestamp": doc.get("timestamp"),
+        "unread_count": user_unread,
+        "platform": doc.get("platform") or "internal",
+        "type": "team",
+        "participants": participants,
+        "is_online": is_online
+    }
+
+
+async def fetch_conversations_new(
+    org_id: str, 
+    current_user_id: Optional[str] = None, 
+    skip: int = 0, 
+    limit: int = 50,
+    search: Optional[str] = None,
+    active_tab: str = "all",
+    unread_only: bool = False,
+    platform: Optional[str] = None,
+    priority: Optional[str] = None
+) -> List[Dict]:
+    start_time = time.time()
+    collection = _org_collection("conversations", org_id)
+
+    query = _conversation_list_query(current_user_id, search, active_tab, unread_only, platform, priority)
+
+    # Reshape server-side: only the wire-format fields come back, with dates
+    # already formatted, so the Python side is a thin pass over the results
+    cursor = collection.aggregate([
+        {"$match": query},
+        {"$sort": {"last_message_timestamp": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": _CONVERSATION_LIST_PROJECTION}
+    ])
 
     # Fetch all docs
     raw_docs = await cursor.to_list(length=limit)
@@ -117,73 +244,7 @@ async def fetch_conversations_new(
     fetch_time = time.time()
     logger.info(f"[TIMING] Mongo fetch: {fetch_time - start_time:.4f}s")
 
-    # Transform (keep it simple and fast)
-    result = []
-    for doc in raw_docs:
-        conv_type = doc.get("type")
-        platform = doc.get("platform")
-        
-        if conv_type == "team":
-            # For Team chats, use participants but check online status
-            participants = doc.get("participants", [])
-            other_participants = [p for p in participants if p != current_user_id]
-            
-            # logic for "is_online": if ANY other participant is online
-            is_online = False
-            if other_participants:
-                for p_id in other_participants:
-                    if p_id in services.agent_clients and services.agent_clients[p_id]:
-                        is_online = True
-                        break
-            
-            unread_map = doc.get("unread", {})
-            user_unread = unread_map.get(current_user_id, 0) if current_user_id else 0
-            
-            conv_obj = {
-                "id": doc.get("conversation_id"),
-                "customer_name": doc.get("customer_name") or doc.get("conversation_id"),
-                "last_message": doc.get("last_message", ""),
-                "timestamp": (
-                    doc["last_message_timestamp"].isoformat()
-                    if isinstance(doc.get("last_message_timestamp"), datetime)
-                    else None
-                ),
-                "unread_count": user_unread,
-                "platform": platform or "internal",
-                "type": "team",
-                "participants": participants,
-                "is_online": is_online
-            }
-        else:
-            conv_obj = {
-                "id": doc.get("conversation_id"),
-                "platform": platform,
-                "type": conv_type,
-                "customer_id": doc.get("customer_username"),
-                "phone_number": doc.get("customer_id") if platform == "whatsapp" else None,
-                "customer_name": doc.get("customer_name") or "Unknown",
-                "last_message": doc.get("last_message") or "",
-                "last_message_is_private_note": doc.get("last_message_is_private_note", False),
-                "timestamp": (
-                    doc["last_message_timestamp"].isoformat()
-                    if isinstance(doc.get("last_message_timestamp"), datetime)
-                    else None
-                ),
-                "unread_count": doc.get("unread_count", 0),
-                "status": doc.get("status"),
-                "priority": doc.get("priority"),
-                "sentiment": doc.get("sentiment"),
-                "assigned_agent": doc.get("assigned_agent", {}),
-                "is_ai_enabled": doc.get("is_ai_enabled"),
-                "reply_window_ends_at": doc.get("reply_window_ends_at").isoformat() if isinstance(doc.get("reply_window_ends_at"), datetime) else None,
-                "assignment_history": doc.get("assignment_history", []),
-                "suggestions": doc.get("suggestions", []),
-                "summary": doc.get("summary", []),
-                "participants": doc.get("participants", []),
-                "unread": doc.get("unread", {})
-            }
-            
-        result.append(conv_obj)
+    result = [_finish_conversation_item(doc, current_user_id) for doc in raw_docs]
 
     end_time = time.time()
     logger.info(f"[TIMING] Python transform: {end_time - fetch_time:.4f}s")
@@ -192,18 +253,45 @@ async def fetch_conversations_new(
     return result
 
 
+async def stream_conversations(
+    org_id: str,
+    current_user_id: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    search: Optional[str] = None,
+    active_tab: str = "all",
+    unread_only: bool = False,
+    platform: Optional[str] = None,
+    priority: Optional[str] = None
+):
+    """
+    Same items and filters as fetch_conversations_new, yielded as NDJSON lines
+    (one orjson-encoded conversation per line) straight off the cursor, so large
+    lists are never materialized in memory. No limit by default.
+    """
+    query = _conversation_list_query(current_user_id, search, active_tab, unread_only, platform, priority)
+
+    pipeline = [
+        {"$match": query},
+        {"$sort": {"last_message_timestamp": -1}},
+        {"$skip": skip}
+    ]
+    if limit:
+        pipeline.append({"$limit": limit})
+    pipeline.append({"$project": _CONVERSATION_LIST_PROJECTION})
+
+    cursor = _org_collection("conversations", org_id).aggregate(pipeline, batchSize=1000)
+    async for doc in cursor:
+        yield orjson.dumps(_finish_conversation_item(doc, current_user_id)) + b"\n"
+
+
 async def fetch_conversation(org_id: str, conversation_id: str):
     """
     Fetch a specific conversation by its ID for a given organization.
     """
     try:
-        async_db = get_async_mongo_db()
-
-        # organization specific collection name for conversations
-        org_conversations_collection_name = f"conversations_{org_id}"
-        
-        # Get the collection
-        org_conversations_collection = async_db[org_conversations_collection_name]
+        # organization specific collection for conversations
+        org_conversations_collection = _org_collection("conversations", org_id)
 
         conversation = await org_conversations_collection.find_one(
             {"conversation_id": conversation_id},
@@ -213,11 +301,7 @@ async def fetch_conversation(org_id: str, conversation_id: str):
         if not conversation:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
-        
-        for field in conversation:
-            if isinstance(conversation[field], datetime):
-                conversation[field] = conversation[field].isoformat()
-        
+        # Datetimes are left as-is; the route's ORJSONResponse encodes them
         return conversation
     
     except HTTPException:
@@ -244,102 +328,71 @@ async def fetch_messages(org_id: str, conversation_id: str, agent_id: str, agent
     """
 
     try:
-        org_messages_collection_name = f"messages_{org_id}"
-        private_note_collection_name = f"private_notes_{org_id}"
-
         # Auto assigning agent to the conversation if it is unassigned
-        org_conversations_collection_name = f"conversations_{org_id}"
-        convo_collection = db[org_conversations_collection_name]
+        convo_collection = _org_collection("conversations", org_id)
 
         now = datetime.now(timezone.utc)
 
-        assigned_convo = convo_collection.find_one_and_update(
-            {
-                "conversation_id": conversation_id,
-                "$or": [
-                    {"assigned_agent" : {"$exists": False}},
-                    {"assigned_agent": None}
-                ],
-                "status": "open"
-            },
-            {
-                "$set": {
-                    "assigned_agent": {
-                        "id": agent_id,
-                        "username": agent_username,
-                        "assigned_at": now
-                    }
-                },
-                "$push": {
-                    "assignment_history": {
-                        "id": agent_id,
-                        "username": agent_username,
-                        "assigned_at": now
+        assignment = {
+            "id": agent_id,
+            "username": agent_username,
+            "assigned_at": now
+        }
+        # Unassigned (missing or null) and still open
+        should_assign = {
+            "$and": [
+                {"$eq": [{"$ifNull": ["$assigned_agent", None]}, None]},
+                {"$eq": ["$status", "open"]}
+            ]
+        }
+        is_team = {"$eq": ["$type", "team"]}
+
+        # One pipeline update: assign if unassigned, and reset the unread counter
+        # (per-participant for team chats, unread_count otherwise)
+        assigned_convo = await convo_collection.find_one_and_update(
+            {"conversation_id": conversation_id},
+            [
+                {
+                    "$set": {
+                        "assigned_agent": {"$cond": [should_assign, {"$literal": assignment}, "$assigned_agent"]},
+                        "assignment_history": {
+                            "$cond": [
+                                should_assign,
+                                {"$concatArrays": [{"$ifNull": ["$assignment_history", []]}, [{"$literal": assignment}]]},
+                                "$assignment_history"
+                            ]
+                        },
+                        "unread": {
+                            "$cond": [
+                                is_team,
+                                {"$mergeObjects": [{"$ifNull": ["$unread", {}]}, {"$literal": {agent_id: 0}}]},
+                                "$unread"
+                            ]
+                        },
+                        "unread_count": {"$cond": [is_team, "$unread_count", 0]}
                     }
                 }
-            },
+            ],
             projection={"assigned_agent": 1, "assignment_history": 1, "type": 1, "participants": 1, "_id": 0},
             return_document=ReturnDocument.AFTER
         )
 
-        if assigned_convo is None:
-             # The conversation was already assigned or closed. Fetch the current assignment details.
-             current_convo = convo_collection.find_one(
-                 {"conversation_id": conversation_id},
-                 projection={"assigned_agent": 1, "assignment_history": 1, "type": 1, "participants": 1, "_id": 0}
-             )
-             assigned_convo = current_convo
-
-        # Reset unread count
-        if assigned_convo and assigned_convo.get("type") == "team":
-            convo_collection.update_one(
+        # Fetching messages and private notes concurrently
+        # (a missing collection just yields an empty cursor)
+        messages, notes = await asyncio.gather(
+            _org_collection("messages", org_id).find(
                 {"conversation_id": conversation_id},
-                {
-                    "$set": {
-                        f"unread.{agent_id}": 0
-                    }
-                }
-            )
-        else:
-            convo_collection.update_one(
-                {"conversation_id": conversation_id},
-                {
-                    "$set": {
-                        "unread_count": 0
-                    }
-                }
-            )
-
-        messages = []
-        notes = []
-        
-        # Fetching messages
-        if org_messages_collection_name in db.list_collection_names():
-            org_messages_collection = db[org_messages_collection_name]
-            messages = list(org_messages_collection.find(
+                {"_id": 0}
+            ).sort("timestamp", 1).to_list(length=None),
+            _org_collection("private_notes", org_id).find(
                 {"conversation_id": conversation_id},
-                {"_id": 0}  
-            ).sort("timestamp", 1))  
-        
-        #Fetching private notes
-        if private_note_collection_name in db.list_collection_names():
-            private_note_collection = db[private_note_collection_name]
-            notes = list(private_note_collection.find(
-                    {"conversation_id": conversation_id},
-                    {"_id": 0}
-                ).sort("timestamp", 1)
-            )
-
-        # Merging both messages and notes
-        combined = messages + notes
-
-        # Normalizing timestamps
-        for msg in combined:
-            ts = msg.get("timestamp")
-            if isinstance(ts, datetime):
-                msg["timestamp"] = ts.isoformat()
+                {"_id": 0}
+            ).sort("timestamp", 1).to_list(length=None)
+        )
 
-        combined.sort(key=lambda x: x.get("timestamp"), reverse=False)
+        # Merging both messages and notes (each is already sorted by timestamp)
+        # Timestamps stay datetimes; the route's ORJSONResponse encodes them in ISO format
+        combined = list(heapq.merge(messages, notes, key=lambda x: x.get("timestamp")))
         
         return {"messages": combined, "assignment": assigned_convo}
     
@@ -355,38 +408,42 @@ async def close_conversation(org_id: str, conversation_id: str, reason: str):
     Mark a conversation as closed for a given organization.
     """
     try:
-        conversation_collection = db[f"conversations_{org_id}"]
+        conversation_collection = _org_collection("conversations", org_id)
 
         now = datetime.now(timezone.utc)
 
-        conversation =  conversation_collection.find_one({"conversation_id": conversation_id})
-
-        if not conversation:
-            return {"message": "Conversation not found. Nothing to close."}
-
-        result = conversation_collection.find_one_and_update(
+        # Close and stamp assigned_until on the last assignment_history entry
+        # in one pipeline update (no separate existence read)
+        result = await conversation_collection.find_one_and_update(
             {"conversation_id": conversation_id},
-            {
-                "$set": {
-                    "status": "closed",
-                    "closed_at": now,
-                    "last_message_timestamp": now,
-                    "assigned_agent": None,
-                    "closure_reason": reason
+            [
+                {
+                    "$set": {
+                        "status": "closed",
+                        "closed_at": now,
+                        "last_message_timestamp": now,
+                        "assigned_agent": None,
+                        "closure_reason": reason,
+                        "assignment_history": {
+                            "$cond": [
+                                {"$gt": [{"$size": {"$ifNull": ["$assignment_history", []]}}, 0]},
+                                {
+                                    "$concatArrays": [
+                                        {"$slice": ["$assignment_history", {"$subtract": [{"$size": "$assignment_history"}, 1]}]},
+                                        [{"$mergeObjects": [{"$arrayElemAt": ["$assignment_history", -1]}, {"assigned_until": now}]}]
+                                    ]
+                                },
+                                "$assignment_history"
+                            ]
+                        }
+                    }
                 }
-            },
+            ],
             return_document=ReturnDocument.AFTER
         )
 
-        if "assignment_history" in conversation and conversation["assignment_history"]:
-            last_index = len(conversation["assignment_history"]) - 1
-            update_path = f"assignment_history.{last_index}.assigned_until"
-
-            result = conversation_collection.find_one_and_update(
-                {"conversation_id": conversation_id},
-                {"$set": {update_path: now}},
-                return_document=ReturnDocument.AFTER
-            )
+        if result is None:
+            return {"message": "Conversation not found. Nothing to close."}
 
         convo = serialize_mongo(result)
 
@@ -459,10 +516,10 @@ def move_messages_unarchive_safe(source_name, target_name):
     for doc in cursor:
         buffer.append(doc)
         if len(buffer) >= services.BATCH_SIZE:
-            db[target_name].insert_many(buffer)
+            db[target_name].insert_many(buffer, ordered=False)
             buffer = []
     if buffer:
-        db[target_name].insert_many(buffer)
+        db[target_name].insert_many(buffer, ordered=False)
     
     db[source_name].delete_many({})
 
@@ -476,11 +533,11 @@ def move_private_notes_unarchive_safe(source_name: str, target_name: str):
 
         if len(buffer) >= services.BATCH_SIZE:
             if buffer:
-                db[target_name].insert_many(buffer)
+                db[target_name].insert_many(buffer, ordered=False)
                 buffer = []
 
     if buffer:
-        db[target_name].insert_many(buffer)
+        db[target_name].insert_many(buffer, ordered=False)
 
     db[source_name].delete_many({})
 
@@ -492,19 +549,20 @@ def move_conversations_unarchive_safe(source_name: str, target_name: str):
     """
     cursor = db[source_name].find({}, {"_id": 0})
 
+    # $setOnInsert upserts let the server skip conversations that already exist,
+    # instead of one find_one per archived doc
     buffer = []
     for convo in cursor:
-        existing = db[target_name].find_one({"conversation_id": convo["conversation_id"]})
-        if not existing:
-            buffer.append(convo)
+        buffer.append(
+            UpdateOne({"conversation_id": convo["conversation_id"]}, {"$setOnInsert": convo}, upsert=True)
+        )
 
         if len(buffer) >= services.BATCH_SIZE:
-            if buffer:
-                db[target_name].insert_many(buffer)
-                buffer = []
+            db[target_name].bulk_write(buffer, ordered=False)
+            buffer = []
 
     if buffer:
-        db[target_name].insert_many(buffer)
+        db[target_name].bulk_write(buffer, ordered=False)
 
     db[source_name].delete_many({})
 
@@ -515,8 +573,6 @@ async def add_private_note(org_id: str, conversation_id: str, note: str, posted_
     """
 
     try:
-        private_notes_collection = db[f"private_notes_{org_id}"]
-
         note_doc = {
             "note_id": str(uuid.uuid4()),
             "conversation_id": conversation_id,
@@ -528,10 +584,22 @@ async def add_private_note(org_id: str, conversation_id: str, note: str, posted_
             "role": role
         }
 
-        result = private_notes_collection.insert_one(note_doc)
+        # _private_note_writer inserts it with any other notes for the org that arrive
+        # within PRIVATE_NOTE_BATCH_WINDOW_SECONDS and resolves the future once written
+        queue = _PRIVATE_NOTE_QUEUES.get(org_id)
+        if queue is None:
+            queue = _PRIVATE_NOTE_QUEUES[org_id] = asyncio.Queue()
+            writer = asyncio.create_task(_private_note_writer(org_id, queue))
+            _BG_TASKS.add(writer)
+            writer.add_done_callback(_BG_TASKS.discard)
 
-        if not result.inserted_id:
-            raise HTTPException(status_code=500, detail="Failed to add private note")
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((note_doc, future))
+
+        try:
+            await future
+        except PyMongoError as e:
+            raise HTTPException(status_code=500, detail=f"Database error adding private note: {str(e)}")
         
         return True
     
@@ -540,28 +608,81 @@ async def add_private_note(org_id: str, conversation_id: str, note: str, posted_
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
     
+async def _private_note_writer(org_id: str, queue: asyncio.Queue):
+    """
+    Per-org background writer: drains up to PRIVATE_NOTE_BATCH_MAX notes (or whatever
+    arrives within PRIVATE_NOTE_BATCH_WINDOW_SECONDS), inserts them in one insert_many
+    and resolves each note's future with the outcome of its own insert.
+    """
+    loop = asyncio.get_running_loop()
+    private_notes_collection = _org_collection("private_notes", org_id)
+
+    while True:
+        try:
+            batch = [await asyncio.wait_for(queue.get(), PRIVATE_NOTE_WRITER_IDLE_SECONDS)]
+        except asyncio.TimeoutError:
+            # No await between this check and add_private_note's put, so nothing can
+            # be enqueued on a queue that has already been dropped
+            if queue.empty():
+                if _PRIVATE_NOTE_QUEUES.get(org_id) is queue:
+                    del _PRIVATE_NOTE_QUEUES[org_id]
+                return
+            continue
+
+        deadline = loop.time() + PRIVATE_NOTE_BATCH_WINDOW_SECONDS
+        while len(batch) < PRIVATE_NOTE_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            await private_notes_collection.insert_many([note_doc for note_doc, _ in batch], ordered=False)
+            failed = {}
+        except BulkWriteError as e:
+            # ordered=False: every note except the ones listed in writeErrors was written
+            failed = {error["index"]: e for error in e.details.get("writeErrors", [])}
+        except Exception as e:
+            failed = dict.fromkeys(range(len(batch)), e)
+
+        if failed:
+            logger.error(f"Error inserting {len(failed)} of {len(batch)} private notes for org {org_id}: {next(iter(failed.values()))}")
+
+        for index, (_, future) in enumerate(batch):
+            if not future.done():
+                if index in failed:
+                    future.set_exception(failed[index])
+                else:
+                    future.set_result(True)
+            queue.task_done()
+
+async def flush_private_notes():
+    """Wait until every queued private note has been written. Called from lifespan.py on shutdown."""
+    await asyncio.gather(*(queue.join() for queue in _PRIVATE_NOTE_QUEUES.values()))
+    
 async def delete_private_note(org_id: str, note_id: str) -> bool:
     """
     Removes the private_note field from a specific conversation document.
     """
 
     try:
-        messages_collection = db[f"messages_{org_id}"]
+        messages_collection = _org_collection("messages", org_id)
 
-        try:
-            _id = ObjectId(note_id)
-        except Exception:
+        if not _HEX24.match(note_id):
             raise HTTPException(status_code=400, detail="Invalid note ID")
 
-        note = messages_collection.find_one({
-            "_id": _id, "message_type": "private_note"
+        note = await messages_collection.find_one_and_delete({
+            "_id": ObjectId(note_id), "message_type": "private_note"
         })
 
-        if not note:
+        if note is None:
             raise HTTPException(status_code=404, detail="Private note not found")
-        
-        messages_collection.delete_one({"_id": _id})
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting private note: {str(e)}")
 
@@ -573,7 +694,7 @@ async def send_message(org_id: str, platform: str, conversation_id: str, content
 
     if platform == "whatsapp":
 
-        wa_id = db.organizations.find_one({"org_id": org_id}, {"wa_id": 1}).get("wa_id")
+        wa_id = _get_org_platform_ids(org_id).get("wa_id")
 
         if file:
             recipient_id = conversation_id.replace("whatsapp_", "")
@@ -614,12 +735,15 @@ async def send_message(org_id: str, platform: str, conversation_id: str, content
         return res
     
     elif platform == "instagram":
-        ig_id = db.organizations.find_one({"org_id": org_id}, {"ig_id": 1}).get("ig_id")
+        ig_id = _get_org_platform_ids(org_id).get("ig_id")
 
-        recipient = db[f"conversations_{org_id}"].find_one(
-            {"conversation_id": conversation_id},
-            {"customer_id": 1}
-        ).get("customer_id")
+        recipient = _ig_recipient_cache.get((org_id, conversation_id))
+        if recipient is None:
+            recipient = _org_collection("conversations", org_id, use_async=False).find_one(
+                {"conversation_id": conversation_id},
+                {"customer_id": 1}
+            ).get("customer_id")
+            _ig_recipient_cache[(org_id, conversation_id)] = recipient
 
 
         if file:
@@ -648,7 +772,7 @@ async def send_message(org_id: str, platform: str, conversation_id: str, content
             conversation_id = f"team_{sorted_ids[0]}_{sorted_ids[1]}"
         
         now = datetime.now(timezone.utc)
-        convo_collection = db[f"conversations_{org_id}"]
+        convo_collection = _org_collection("conversations", org_id, use_async=False)
         
         convo = convo_collection.find_one({"conversation_id": conversation_id})
         
@@ -699,7 +823,7 @@ async def send_message(org_id: str, platform: str, conversation_id: str, content
                     }
                 )
         
-        messages_collection = db[f"messages_{org_id}"]
+        messages_collection = _org_collection("messages", org_id, use_async=False)
         sender_id = context.get("sender_id") if context else None
         sender_name = context.get("sender_name") if context else None
         
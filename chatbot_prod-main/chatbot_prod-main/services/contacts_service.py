@@ -7,7 +7,7 @@ from pymongo import UpdateOne
 
 # Internal Modules
 from core.services import services
-from database import get_mongo_db
+from database import get_mongo_db, get_async_mongo_db
 from loguru import logger
 from services.websocket_service import broadcast_on_stats_update
 
@@ -15,6 +15,8 @@ from services.websocket_service import broadcast_on_stats_update
 
 db = get_mongo_db()
 
+CONTACTS_FETCH_BATCH_SIZE = 5000
+
 def store_contact_background(background_tasks: BackgroundTasks, org_id: str, platform: str, contact_data: dict):
     """
     Trigger storing contact in the background.
@@ -41,11 +43,13 @@ def store_contact(org_id: str, platform: str, contact_data: dict):
         logger.warning(f"Unknown platform {platform} - skipping contact storage.")
         return
 
-    if contacts_collection.find_one(unique_filter):
+    # Single round-trip: only inserts when no contact matches the platform id
+    result = contacts_collection.update_one(unique_filter, {"$setOnInsert": contact_data}, upsert=True)
+
+    if result.upserted_id is None:
         logger.info(f"Contact already exists for {platform}: {unique_filter}")
         return
-    
-    contacts_collection.insert_one(contact_data)
+
     logger.success(f"Added new contact for {platform}: {unique_filter}")
     
 async def get_contacts_for_org(org_id: str):
@@ -55,19 +59,15 @@ async def get_contacts_for_org(org_id: str):
     try:
         collection_name = f"contacts_{org_id}"
 
-        if collection_name not in db.list_collection_names():
-            logger.info(f"Collection {collection_name} does not exist.")
-            return []
-
-        contacts_collection = db[collection_name]
+        # A missing collection simply yields an empty cursor
+        contacts_collection = get_async_mongo_db()[collection_name]
 
         projection = {"_id": 0}
 
-        cursor = contacts_collection.find({}, projection).batch_size(services.BATCH_SIZE)
+        # Large batches keep getMore round-trips down on big contact lists
+        cursor = contacts_collection.find({}, projection).batch_size(CONTACTS_FETCH_BATCH_SIZE)
 
-        contacts = []
-        for contact in cursor:
-            contacts.append(contact)
+        contacts = await cursor.to_list(length=None)
 
         logger.info(f"Retrieved {len(contacts)} contacts for org {org_id}.")
         return contacts
@@ -87,9 +87,6 @@ async def update_contact_tag_categories(org_id: str, conversation_id: str, categ
     try:
         collection_name = f"contacts_{org_id}"
 
-        if collection_name not in db.list_collection_names():
-            raise HTTPException(status_code=404, detail=f"No contacts found for org {org_id}")
-
         contacts_collection = db[collection_name]
 
         result = contacts_collection.find_one_and_update(
@@ -126,9 +123,6 @@ async def update_contact_labels(org_id: str, conversation_id: str, labels: list)
     try:
         collection_name = f"contacts_{org_id}"
 
-        if collection_name not in db.list_collection_names():
-            raise HTTPException(status_code=404, detail=f"No contacts found for org {org_id}")
-
         contacts_collection = db[collection_name]
 
         result = contacts_collection.find_one_and_update(
@@ -249,45 +243,39 @@ def process_bulk_wa_contact_upload(org_id: str, file_content: bytes, filename: s
 
     collection_name = f"contacts_{org_id}"
     contacts_collection = db[collection_name]
-    bulk_ops = []
     now = datetime.now(timezone.utc)
-    
-    skipped_rows = 0
-
-    for index, row in df.iterrows():
-        full_name = str(row['name']).strip() if pd.notna(row['name']) else None
-        
-        raw_phone = str(row['phone']) if pd.notna(row['phone']) else ""
-        clean_phone = "".join(filter(str.isdigit, raw_phone))
-
-        if not full_name or not clean_phone or len(clean_phone) < 10:
-            skipped_rows += 1
-            continue
-
-        
-
-        contact_doc = {
-            "whatsapp_id": None,
-            "full_name": full_name,
-            "phone_number": clean_phone, 
-            "country": None,
-            "profile_url": None,
-            "conversation_id": f"whatsapp_{clean_phone}",
-            "email": None,
-            "categories": [],
-            "labels": [],
-            "platform": "whatsapp",
-            "created_at": now
-        }
-
 
-        bulk_ops.append(
-            UpdateOne(
-                {"phone_number": clean_phone}, 
-                {"$setOnInsert": contact_doc}, 
-                upsert=True
-            )
+    # Clean and validate whole columns at once instead of row by row
+    names = df['name'].where(df['name'].notna(), "").astype(str).str.strip()
+    phones = df['phone'].where(df['phone'].notna(), "").astype(str).str.replace(r'\D', '', regex=True)
+
+    valid = names.ne("") & phones.str.len().ge(10)
+    skipped_rows = int((~valid).sum())
+
+    contact_template = {
+        "whatsapp_id": None,
+        "country": None,
+        "profile_url": None,
+        "email": None,
+        "platform": "whatsapp",
+        "created_at": now
+    }
+
+    bulk_ops = [
+        UpdateOne(
+            {"phone_number": clean_phone}, 
+            {"$setOnInsert": {
+                **contact_template,
+                "full_name": full_name,
+                "phone_number": clean_phone,
+                "conversation_id": f"whatsapp_{clean_phone}",
+                "categories": [],
+                "labels": []
+            }}, 
+            upsert=True
         )
+        for full_name, clean_phone in zip(names[valid], phones[valid])
+    ]
 
     if bulk_ops:
         result = contacts_collection.bulk_write(bulk_ops, ordered=False)
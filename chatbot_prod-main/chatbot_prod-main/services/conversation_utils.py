@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from unittest import result
-from database import get_mongo_db
+from database import get_async_mongo_db
 from fastapi import HTTPException
 from pymongo.errors import PyMongoError
 from pymongo import ReturnDocument
@@ -8,17 +8,16 @@ from services.utils import serialize_mongo
 from loguru import logger
 
 
-db = get_mongo_db()
-
 async def reopen_conversation(org_id: str, conversation_id: str):
     """
     Reopen a closed conversation by removing the 'closed_at' field.
     """
     try:
-        conversation_collection = db[f"conversations_{org_id}"]
+        async_db = get_async_mongo_db()
+        conversation_collection = async_db[f"conversations_{org_id}"]
 
         try:
-            result = conversation_collection.find_one_and_update(
+            result = await conversation_collection.find_one_and_update(
                 {"conversation_id": conversation_id},
                 {
                     "$unset": {
@@ -3,6 +3,10 @@ from agents.followup_agent.follow_up_agent import generate_followup_message
 
 db = get_mongo_db()
 
+def _string_or_empty(field: str) -> dict:
+    """Aggregation expression: the field if it is a string, otherwise "" ($concat only accepts strings)"""
+    return {"$cond": [{"$eq": [{"$type": field}, "string"]}, field, ""]}
+
 async def get_followup_message(org_id: str, conversation_id: str) -> dict:
     """
     Fetches the latest 30 messages for a given conversation_id, 
@@ -16,12 +20,33 @@ async def get_followup_message(org_id: str, conversation_id: str) -> dict:
 
     messages_collection = db[f"messages_{org_id}"]
 
-    # Fetch messages for the given conversation_id, sorted by timestamp (ascending)
-    messages = list(messages_collection.find({"conversation_id": conversation_id}).sort("timestamp", 1).limit(30))
-
-
-    # Combine message content into a single string
-    conversation_text = "\n".join([f"{msg['role']}: {msg['content']}" for msg in messages])
+    # Fetch messages for the given conversation_id, sorted by timestamp (ascending),
+    # and combine them into a single "role: content" string server-side
+    messages = list(messages_collection.aggregate([
+        {"$match": {"conversation_id": conversation_id}},
+        {"$sort": {"timestamp": 1}},
+        {"$limit": 30},
+        {"$group": {
+            "_id": None,
+            "lines": {"$push": {"$concat": [
+                _string_or_empty("$role"), ": ", _string_or_empty("$content")
+            ]}}
+        }},
+        {"$project": {
+            "_id": 0,
+            "text": {"$reduce": {
+                "input": "$lines",
+                "initialValue": "",
+                "in": {"$cond": [
+                    {"$eq": ["$$value", ""]},
+                    "$$this",
+                    {"$concat": ["$$value", "\n", "$$this"]}
+                ]}
+            }}
+        }}
+    ]))
+
+    conversation_text = messages[0]["text"] if messages else ""
 
     # Generate the follow-up message
     followup_object = generate_followup_message(conversation_text)
@@ -1,11 +1,361 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import random
+import socket
+import threading
+import time
 import httpx
+import numpy as np
+import orjson
+from cachetools import LRUCache, TTLCache
 from typing import Dict, Any, Optional
 from loguru import logger
 
+# Optional: libuv-backed event loop for the loops this module owns. uvicorn already
+# picks uvloop for the app loop when it is installed, so no global policy is set here.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from config.settings import CHATBOT_BATCH_MS, CHATBOT_BATCH_MAX, CHATBOT_MAX_INFLIGHT, CHATBOT_SEMANTIC_CACHE, KOYEB2
+
 
 # Base URL for the chatbot API
 CHATBOT_BASE_URL = "https://heidelai-backend2.koyeb.app"
 
+# Shared client so every message reuses keep-alive connections to the chatbot
+# instead of paying a fresh TCP + TLS handshake. httpx async clients are bound to
+# the loop they run on, so there is one per loop: the app loop's, and the one
+# send_to_chatbot_sync uses when no app loop is running.
+_chatbot_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+# The application's event loop (first loop other than _sync_loop to use the client)
+_app_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Background loop for send_to_chatbot_sync calls made without a running app loop
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+# Per-phase limits so a slow connect or an exhausted pool fails fast instead of eating
+# the whole budget; only the read (LLM generation) gets the caller's timeout
+CONNECT_TIMEOUT_SECONDS = 3.0
+WRITE_TIMEOUT_SECONDS = 5.0
+POOL_TIMEOUT_SECONDS = 2.0
+
+def _request_timeout(read_timeout: float) -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=CONNECT_TIMEOUT_SECONDS,
+        read=read_timeout,
+        write=WRITE_TIMEOUT_SECONDS,
+        pool=POOL_TIMEOUT_SECONDS
+    )
+
+# No Nagle delay on small request bodies; TCP keepalive so idle pooled sockets survive
+# NAT/load-balancer idle timeouts between bursts. TCP_KEEPIDLE is Linux-only.
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):
+    _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30))
+
+def get_chatbot_client() -> httpx.AsyncClient:
+    """Lazily create the shared async chatbot client for the running loop."""
+    global _app_loop
+    loop = asyncio.get_running_loop()
+    client = _chatbot_clients.get(loop)
+    if client is None:
+        # HTTP/2 lets concurrent messages multiplex over one connection (h2 is a dependency)
+        # The transport retries failed connection attempts; http2/limits must be set on it
+        # since the client ignores its own when given a transport
+        client = _chatbot_clients[loop] = httpx.AsyncClient(
+            base_url=CHATBOT_BASE_URL,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=2,
+                socket_options=_SOCKET_OPTIONS,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            ),
+            # Bodies are pre-serialized with orjson and sent as content=, so the JSON
+            # headers are set once here rather than per request
+            headers={"Content-Type": "application/json", "User-Agent": "heidelai-bot/1"},
+            timeout=_request_timeout(30.0)
+        )
+        if _app_loop is None and loop is not _sync_loop:
+            _app_loop = loop
+    return client
+
+# Caps in-flight chatbot requests so a burst (e.g. a campaign blast) queues here instead
+# of exhausting the connection pool and piling onto the upstream. One per loop, like the clients.
+_inflight_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+INFLIGHT_WAIT_WARN_SECONDS = 1.0
+_last_saturation_warning = 0.0
+
+# Transient upstream failures (gateway errors from Koyeb, dropped connections) are retried
+# with exponential backoff + jitter, honoring Retry-After. 4xx responses are never retried.
+CHATBOT_MAX_ATTEMPTS = 3
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+MAX_RETRY_DELAY_SECONDS = 2.0
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), MAX_RETRY_DELAY_SECONDS)
+    return min(2 ** attempt * 0.1, MAX_RETRY_DELAY_SECONDS) + random.random() * 0.1
+
+async def _post_chatbot(url: str, body: bytes, timeout: float, headers: Optional[dict] = None) -> httpx.Response:
+    """POST a pre-serialized JSON body, retrying transient failures (see CHATBOT_MAX_ATTEMPTS)."""
+    for attempt in range(CHATBOT_MAX_ATTEMPTS):
+        is_last_attempt = attempt == CHATBOT_MAX_ATTEMPTS - 1
+        try:
+            response = await _post_chatbot_once(url, body, timeout, headers)
+        except httpx.NetworkError as e:
+            if is_last_attempt:
+                raise
+            delay = _retry_delay(attempt)
+            logger.warning("Chatbot request to {} failed ({}), retrying in {:.2f}s", url, e, delay)
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or is_last_attempt:
+                return response
+            delay = _retry_delay(attempt, response)
+            logger.warning("Chatbot returned {} for {}, retrying in {:.2f}s", response.status_code, url, delay)
+        await asyncio.sleep(delay)
+
+async def _post_chatbot_once(url: str, body: bytes, timeout: float, headers: Optional[dict] = None) -> httpx.Response:
+    """POST a pre-serialized JSON body once a CHATBOT_MAX_INFLIGHT slot is free."""
+    global _last_saturation_warning
+    loop = asyncio.get_running_loop()
+    semaphore = _inflight_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _inflight_semaphores[loop] = asyncio.Semaphore(CHATBOT_MAX_INFLIGHT)
+
+    wait_started = time.monotonic()
+    async with semaphore:
+        waited = time.monotonic() - wait_started
+        # At most one warning a minute while the upstream is saturated
+        if waited > INFLIGHT_WAIT_WARN_SECONDS and wait_started - _last_saturation_warning > 60:
+            _last_saturation_warning = wait_started
+            logger.warning("Chatbot requests queued {:.1f}s for an in-flight slot (limit {})", waited, CHATBOT_MAX_INFLIGHT)
+        response = await get_chatbot_client().post(url, content=body, headers=headers, timeout=_request_timeout(timeout))
+        # Pure network time; compare with the per-call total logged by send_to_chatbot
+        logger.debug("Chatbot POST {} -> {} in {:.0f}ms", url, response.status_code, response.elapsed.total_seconds() * 1000)
+        return response
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="chatbot-sync-loop", daemon=True).start()
+    return _sync_loop
+
+async def _close_loop_client():
+    _inflight_semaphores.pop(asyncio.get_running_loop(), None)
+    client = _chatbot_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+async def close_chatbot_client():
+    """Close the shared chatbot clients. Called from lifespan.py on shutdown."""
+    global _sync_loop
+    await _close_loop_client()
+    if _sync_loop is not None:
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_close_loop_client(), _sync_loop))
+        _sync_loop.call_soon_threadsafe(_sync_loop.stop)
+        _sync_loop = None
+
+# Exact-match reply cache: blake2b(identifier|query) -> chatbot reply. Only replies
+# the chatbot marks "cacheable" are stored (stateless answers like greetings, hours).
+# Shared by the app loop and the sync fallback loop, hence the thread lock.
+_response_cache = TTLCache(maxsize=10000, ttl=600)
+_response_cache_lock = threading.Lock()
+
+def _response_cache_key(identifier: str, query: str) -> str:
+    return hashlib.blake2b(f"{identifier}|{query}".encode(), digest_size=16).hexdigest()
+
+def clear_chatbot_cache():
+    """Drop every cached chatbot reply."""
+    with _response_cache_lock:
+        _response_cache.clear()
+        _semantic_cache.clear()
+
+# Semantic reply cache (CHATBOT_SEMANTIC_CACHE=1): catches paraphrases of cached queries
+# ("what are your hours" / "when do you open"). Per identifier, the normalized query
+# embeddings and their replies; a new query reuses a reply when cosine similarity
+# exceeds SEMANTIC_CACHE_THRESHOLD. Same "cacheable" rule as the exact-match cache.
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_MAX_PER_IDENTIFIER = 100
+# Best-effort lookup: a slow encoder just means a cache miss
+SEMANTIC_EMBED_TIMEOUT_SECONDS = 1.0
+_semantic_cache: LRUCache = LRUCache(maxsize=1000)  # identifier -> (embeddings, replies)
+
+async def _embed_query(query: str) -> Optional[np.ndarray]:
+    """Unit-length embedding of a query from the encoding service, or None if unavailable."""
+    try:
+        # Straight to the encoder: no in-flight slot and no retries, capped end to end
+        response = await asyncio.wait_for(
+            get_chatbot_client().post(
+                f"{KOYEB2}/encode",
+                content=orjson.dumps({"query": query}),
+                timeout=SEMANTIC_EMBED_TIMEOUT_SECONDS
+            ),
+            SEMANTIC_EMBED_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        vector = np.asarray(orjson.loads(response.content)["vector"], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    except Exception as e:
+        logger.debug("Query embedding unavailable, skipping semantic cache: {}", e)
+        return None
+
+def _semantic_lookup(identifier: str, embedding: np.ndarray) -> Optional[str]:
+    with _response_cache_lock:
+        entry = _semantic_cache.get(identifier)
+        if entry is None:
+            return None
+        embeddings, replies = entry
+        scores = embeddings @ embedding
+        best = int(np.argmax(scores))
+        return replies[best] if scores[best] > SEMANTIC_CACHE_THRESHOLD else None
+
+def _semantic_store(identifier: str, embedding: np.ndarray, reply: str):
+    with _response_cache_lock:
+        embeddings, replies = _semantic_cache.get(identifier, (np.empty((0, embedding.shape[0]), dtype=np.float32), []))
+        if embeddings.shape[1] != embedding.shape[0]:
+            embeddings, replies = embeddings[:0].reshape(0, embedding.shape[0]), []
+        embeddings = np.vstack([embeddings, embedding])[-SEMANTIC_CACHE_MAX_PER_IDENTIFIER:]
+        replies = (replies + [reply])[-SEMANTIC_CACHE_MAX_PER_IDENTIFIER:]
+        _semantic_cache[identifier] = (embeddings, replies)
+
+# Queries arriving within CHATBOT_BATCH_MS (up to CHATBOT_BATCH_MAX) are sent as one
+# /chat/batch call. If the chatbot rejects /chat/batch with any 4xx (e.g. no such
+# endpoint), batching is turned off for the rest of the process and every query goes
+# straight to /chat.
+_batch_supported = CHATBOT_BATCH_MS > 0 and CHATBOT_BATCH_MAX > 1
+_pending_chats: list[tuple[dict, float, asyncio.Future]] = []
+_batch_flusher: Optional[asyncio.Task] = None
+
+# Strong references to in-flight flush tasks so they aren't garbage-collected mid-request
+_BG_TASKS: set[asyncio.Task] = set()
+
+def _start_flush(delay: float) -> asyncio.Task:
+    task = asyncio.create_task(_flush_chat_batch(delay))
+    _BG_TASKS.add(task)
+    task.add_done_callback(_BG_TASKS.discard)
+    return task
+
+def _idempotency_key(payloads: list[dict]) -> str:
+    """
+    Deterministic Idempotency-Key for a /chat or /chat/batch call so the chatbot can
+    dedupe our retries. Bucketed by minute so a customer genuinely repeating a message
+    later still gets a fresh answer. Computed once per call, before any retry.
+    """
+    minute_bucket = int(time.time() // 60)
+    key_material = "\n".join(f"{p['identifier']}|{p['query']}" for p in payloads)
+    return hashlib.blake2b(f"{key_material}|{minute_bucket}".encode(), digest_size=16).hexdigest()
+
+async def _post_chat_single(payload: dict, timeout: float) -> dict:
+    """POST one query to /chat and return the decoded response body."""
+    response = await _post_chatbot(
+        "/chat", orjson.dumps(payload), timeout, headers={"Idempotency-Key": _idempotency_key([payload])}
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+async def _request_chat(payload: dict, timeout: float) -> dict:
+    """Send a query to the chatbot, coalescing it with others in the current batch window."""
+    global _batch_flusher
+    # Batch state lives on the app loop; calls on the sync fallback loop go straight through
+    if not _batch_supported or asyncio.get_running_loop() is not _app_loop:
+        return await _post_chat_single(payload, timeout)
+
+    future = asyncio.get_running_loop().create_future()
+    _pending_chats.append((payload, timeout, future))
+
+    if len(_pending_chats) >= CHATBOT_BATCH_MAX:
+        if _batch_flusher is not None:
+            _batch_flusher.cancel()
+        _batch_flusher = _start_flush(0)
+    elif _batch_flusher is None:
+        _batch_flusher = _start_flush(CHATBOT_BATCH_MS / 1000)
+
+    return await future
+
+async def _flush_chat_batch(delay: float):
+    """Send everything queued in _pending_chats after delay seconds and resolve the waiters."""
+    global _batch_supported, _batch_flusher
+    if delay:
+        await asyncio.sleep(delay)
+
+    batch = _pending_chats[:CHATBOT_BATCH_MAX]
+    del _pending_chats[:len(batch)]
+    _batch_flusher = _start_flush(0) if _pending_chats else None
+    if not batch:
+        return
+
+    results = None
+    if len(batch) > 1 and _batch_supported:
+        try:
+            response = await _post_chatbot(
+                "/chat/batch",
+                orjson.dumps({"items": [payload for payload, _, _ in batch]}),
+                max(timeout for _, timeout, _ in batch),
+                headers={"Idempotency-Key": _idempotency_key([payload for payload, _, _ in batch])}
+            )
+            if 400 <= response.status_code < 500:
+                logger.info("Chatbot rejected /chat/batch ({}); sending queries individually", response.status_code)
+                _batch_supported = False
+            else:
+                response.raise_for_status()
+                results = orjson.loads(response.content)["responses"]
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+    if results is None:
+        results = await asyncio.gather(
+            *[_post_chat_single(payload, timeout) for payload, timeout, _ in batch],
+            return_exceptions=True
+        )
+
+    if len(results) != len(batch):
+        logger.error("Chatbot /chat/batch returned {} responses for {} queries", len(results), len(batch))
+
+    for index, (_, _, future) in enumerate(batch):
+        if future.done():
+            continue
+        result = results[index] if index < len(results) else ValueError("No response for query in chatbot batch")
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+# User-facing fallbacks when the chatbot can't be reached
+_ERROR_MESSAGES = {
+    "timeout": "I apologize, but I'm taking longer than usual to respond. Please try again in a moment.",
+    "busy": "I apologize, but I'm handling a lot of messages right now. Please try again in a moment.",
+    "http": "I apologize, but I'm experiencing technical difficulties. Please try again later.",
+    "other": "I apologize, but something went wrong. Please try again later.",
+}
+
+def _build_payload(customer_phone_no: str, message_content: str) -> tuple[str, dict]:
+    """Return the chatbot identifier (whatsapp_-prefixed phone) and the /chat payload."""
+    identifier = f"whatsapp_{customer_phone_no}"
+    return identifier, {"identifier": identifier, "query": message_content}
+
+def _parse_reply(response_data: dict) -> Optional[str]:
+    """Extract the reply text from a /chat response body, or None if it has none."""
+    chatbot_response = response_data.get("response")
+    if not chatbot_response:
+        logger.error("No 'response' field in chatbot response: {}", response_data)
+        return None
+    return chatbot_response
+
 async def send_to_chatbot(
     customer_phone_no: str,
     message_content: str,
@@ -22,58 +372,73 @@ async def send_to_chatbot(
     Returns:
         The chatbot's response text, or None if there was an error
     """
-    # Prepare the identifier with whatsapp_ prefix
-    identifier = f"whatsapp_{customer_phone_no}"
-    
-    # Prepare the request payload
-    payload = {
-        "identifier": identifier,
-        "query": message_content
-    }
+    identifier, payload = _build_payload(customer_phone_no, message_content)
+    # Structured fields ride along in record["extra"]; a serialize=True sink emits them as JSON
+    log = logger.bind(identifier=identifier)
     
-    # API endpoint
-    endpoint = f"{CHATBOT_BASE_URL}/chat"
+    cache_key = _response_cache_key(identifier, message_content)
+    with _response_cache_lock:
+        cached_response = _response_cache.get(cache_key)
+    if cached_response is not None:
+        log.debug("Chatbot cache hit for {}", identifier)
+        return cached_response
+
+    query_embedding = await _embed_query(message_content) if CHATBOT_SEMANTIC_CACHE else None
+    if query_embedding is not None:
+        cached_response = _semantic_lookup(identifier, query_embedding)
+        if cached_response is not None:
+            log.debug("Chatbot semantic cache hit for {}", identifier)
+            return cached_response
     
+    # Total time including batching, in-flight queueing and retries, logged with the outcome
+    started = time.perf_counter()
+    outcome = "err"
     try:
-        logger.info(f"Sending message to chatbot for {identifier}")
-        logger.debug(f"Payload: {payload}")
+        # Arguments rather than f-strings: loguru skips formatting for filtered-out levels, so
+        # the payload (full customer message) is only rendered when DEBUG is on. At INFO the
+        # completion line below is the one record per call.
+        log.debug("Sending message to chatbot for {}", identifier)
+        log.debug("Payload: {}", payload)
         
-        # Make async HTTP request
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                endpoint,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            # Check if request was successful
-            response.raise_for_status()
-            
-            # Parse response
-            response_data = response.json()
-            
-            # Extract the chatbot's response
-            chatbot_response = response_data.get("response")
-            
-            if chatbot_response:
-                logger.info(f"Received response from chatbot for {identifier}")
-                # logger.debug(f"Response: {chatbot_response[:100]}...")
-                return chatbot_response
-            else:
-                logger.error(f"No 'response' field in chatbot response: {response_data}")
-                return None
+        # Make async HTTP request over the shared connection pool (micro-batched)
+        response_data = await _request_chat(payload, timeout)
+        chatbot_response = _parse_reply(response_data)
+        
+        outcome = "ok" if chatbot_response else "empty"
+        if chatbot_response:
+            log.debug("Received response from chatbot for {}", identifier)
+            if response_data.get("cacheable", False) is True:
+                with _response_cache_lock:
+                    _response_cache[cache_key] = chatbot_response
+                if query_embedding is not None:
+                    _semantic_store(identifier, query_embedding, chatbot_response)
+        return chatbot_response
                 
+    except httpx.PoolTimeout:
+        # No free connection within POOL_TIMEOUT_SECONDS: local saturation, not upstream latency
+        outcome = "pool_timeout"
+        log.error("Chatbot connection pool exhausted for {}", identifier)
+        return _ERROR_MESSAGES["busy"]
+        
     except httpx.TimeoutException:
-        logger.error(f"Timeout while calling chatbot for {identifier}")
-        return "I apologize, but I'm taking longer than usual to respond. Please try again in a moment."
+        outcome = "timeout"
+        log.error("Timeout while calling chatbot for {}", identifier)
+        return _ERROR_MESSAGES["timeout"]
         
     except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error from chatbot: {e.response.status_code} - {e.response.text}")
-        return "I apologize, but I'm experiencing technical difficulties. Please try again later."
+        outcome = f"{e.response.status_code // 100}xx"
+        log.error("HTTP error from chatbot: {} - {}", e.response.status_code, e.response.text)
+        return _ERROR_MESSAGES["http"]
         
     except Exception as e:
-        logger.opt(exception=True).error(f"Unexpected error calling chatbot: {str(e)}")
-        return "I apologize, but something went wrong. Please try again later."
+        log.opt(exception=True).error("Unexpected error calling chatbot: {}", e)
+        return _ERROR_MESSAGES["other"]
+
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        log.bind(outcome=outcome, duration_ms=round(duration_ms), query_len=len(message_content)).info(
+            "Chatbot call for {} | outcome={} | {:.0f}ms", identifier, outcome, duration_ms
+        )
 
 
 def send_to_chatbot_sync(
@@ -92,67 +457,65 @@ def send_to_chatbot_sync(
     Returns:
         The chatbot's response text, or None if there was an error
     """
-    import requests
-    
-    # Prepare the identifier with whatsapp_ prefix
-    identifier = f"whatsapp_{customer_phone_no}"
-    
-    # Prepare the request payload
-    payload = {
-        "identifier": identifier,
-        "query": message_content
-    }
-    
-    # API endpoint
-    endpoint = f"{CHATBOT_BASE_URL}/chat"
-    
+    # Run the async path on the app loop (sharing its pooled client) when it is up
+    # and we're not on it; otherwise on a background loop with its own client
     try:
-        logger.info(f"Sending message to chatbot for {identifier}")
-        logger.debug(f"Payload: {payload}")
-        
-        # Make synchronous HTTP request
-        response = requests.post(
-            endpoint,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=timeout
-        )
-        
-        # Check if request was successful
-        response.raise_for_status()
-        
-        # Parse response
-        response_data = response.json()
-        
-        # Extract the chatbot's response
-        chatbot_response = response_data.get("response")
-        
-        if chatbot_response:
-            logger.info(f"Received response from chatbot for {identifier}")
-            logger.debug(f"Response: {chatbot_response[:100]}...")
-            return chatbot_response
-        else:
-            logger.error(f"No 'response' field in chatbot response: {response_data}")
-            return None
-            
-    except requests.Timeout:
-        logger.error(f"Timeout while calling chatbot for {identifier}")
-        return "I apologize, but I'm taking longer than usual to respond. Please try again in a moment."
-        
-    except requests.HTTPError as e:
-        logger.error(f"HTTP error from chatbot: {e.response.status_code} - {e.response.text}")
-        return "I apologize, but I'm experiencing technical difficulties. Please try again later."
-        
-    except Exception as e:
-        logger.opt(exception=True).error(f"Unexpected error calling chatbot: {str(e)}")
-        return "I apologize, but something went wrong. Please try again later."
+        current_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        current_loop = None
+
+    if _app_loop is not None and _app_loop.is_running() and _app_loop is not current_loop:
+        target_loop = _app_loop
+    else:
+        target_loop = _get_sync_loop()
+
+    future = asyncio.run_coroutine_threadsafe(
+        send_to_chatbot(customer_phone_no, message_content, timeout),
+        target_loop
+    )
+    try:
+        return future.result(timeout + 1)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        logger.error("Timeout while calling chatbot for whatsapp_{}", customer_phone_no)
+        return _ERROR_MESSAGES["timeout"]
 
 if __name__ == "__main__":
-    # Example usage
-    import asyncio
-    
-    async def test_chatbot():
-        response = await send_to_chatbot("919511907785", "Hello, how are you?")
-        print("Chatbot response:", response)
-    
-    asyncio.run(test_chatbot())
\ No newline at end of file
+    # Concurrency/latency microbench: python -m services.heidelai_bot --n 100 --concurrency 10
+    import argparse
+    import statistics
+
+    parser = argparse.ArgumentParser(description="Benchmark send_to_chatbot")
+    parser.add_argument("--n", type=int, default=100, help="number of requests")
+    parser.add_argument("--concurrency", type=int, default=10, help="max requests in flight")
+    parser.add_argument("--phone", default="919511907785")
+    parser.add_argument("--message", default="Hello, how are you?")
+    args = parser.parse_args()
+
+    async def benchmark():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        samples = []
+
+        async def one_request():
+            async with semaphore:
+                started = time.perf_counter()
+                await send_to_chatbot(args.phone, args.message)
+                samples.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[one_request() for _ in range(args.n)])
+        total = time.perf_counter() - started
+
+        percentiles = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+        p50, p95, p99 = (percentiles[q - 1] * 1000 for q in (50, 95, 99))
+        print(f"{args.n} requests, concurrency {args.concurrency}: {total:.2f}s total, {args.n / total:.1f} req/s")
+        print(f"p50 {p50:.0f}ms | p95 {p95:.0f}ms | p99 {p99:.0f}ms")
+        # Connection reuse: with pooling this should stay far below n
+        pool = getattr(getattr(get_chatbot_client(), "_transport", None), "_pool", None)
+        if pool is not None:
+            print(f"pooled connections: {len(pool.connections)}")
+        await close_chatbot_client()
+
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    asyncio.run(benchmark())
\ No newline at end of file
@@ -1,10 +1,14 @@
 # Built-in modules
+import asyncio
 import uuid
-import requests
-import json
+import time
+import random
+import httpx
+import orjson
 from typing import Optional
 from datetime import datetime, timezone, timedelta
 from bson.objectid import ObjectId
+from cachetools import TTLCache
 from services.cloudinary_service import upload_media_to_cloudinary
 from services.websocket_service import broadcast_main_ws
 from supabase import create_client, Client
@@ -16,7 +20,7 @@ from fastapi import BackgroundTasks
 # Internal modules
 from core.managers import manager
 from schemas.models import MessageRole
-from database import get_mongo_db, get_mongo_client
+from database import get_mongo_db, get_mongo_client, get_async_mongo_db
 from core.services import services
 from services.scheduler_service import abort_scheduled_message
 from services.conversation_utils import reopen_conversation
@@ -36,8 +40,61 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 db = get_mongo_db()
 
+# Motor handle for the per-message hot path (token lookup, message store, conversation upsert)
+async_db = get_async_mongo_db()
+
 mongo_client = get_mongo_client()
 
+# Shared client for all Graph API calls (keep-alive + HTTP/2 to graph.instagram.com),
+# so sends don't block the event loop or pay a new TLS handshake each time.
+# Closed from lifespan.py via close_ig_client().
+ig_http = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+)
+
+async def close_ig_client():
+    """Close the pooled Graph API client. Called from lifespan.py on shutdown."""
+    await ig_http.aclose()
+
+# Strong references to in-flight WebSocket broadcasts so they aren't garbage-collected mid-send
+_BG_TASKS: set[asyncio.Task] = set()
+
+# Per-conversation message cap, enforced on ~1 in 20 inserts
+MESSAGE_CAP = 500
+MESSAGE_TRIM_SAMPLE_RATE = 0.05
+
+# instagram_id -> (fetched_at, page_access_token). Tokens only change on (re)connect or
+# disconnect, which call invalidate_page_token(); a 401 from Graph also drops the entry.
+PAGE_TOKEN_CACHE_TTL_SECONDS = 300
+_page_token_cache: dict[str, tuple[float, str]] = {}
+
+async def _get_page_token(instagram_id: str) -> Optional[str]:
+    """Page access token of the most recently updated active connection for an IG account."""
+    cached = _page_token_cache.get(instagram_id)
+    if cached and time.monotonic() - cached[0] < PAGE_TOKEN_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    connection = await async_db.instagram_connections.find_one(
+        {"instagram_id": instagram_id, "is_active": True},
+        {"page_access_token": 1},
+        sort=[("last_updated", -1)]
+    )
+    page_access_token = connection.get("page_access_token") if connection else None
+    if page_access_token:
+        _page_token_cache[instagram_id] = (time.monotonic(), page_access_token)
+    return page_access_token
+
+def invalidate_page_token(instagram_id: str):
+    """Drop the cached page token for an IG account (call after connect/disconnect)."""
+    _page_token_cache.pop(instagram_id, None)
+
+def _check_token_rejected(response: httpx.Response, instagram_id: str):
+    if response.status_code == 401:
+        logger.warning(f"Graph API rejected the page token for {instagram_id}, dropping cached token")
+        invalidate_page_token(instagram_id)
+
 async def send_ig_message(id, message_text, instagram_id, mode, org_id) -> dict:
     """
     Send a message to an Instagram user using the appropriate access token
@@ -50,18 +107,11 @@ async def send_ig_message(id, message_text, instagram_id, mode, org_id) -> dict:
     try:
         # If an Instagram business account ID is provided, look up its access token
         if instagram_id:
-            # Query the specific Instagram connection to get its access token
-            connection = db.instagram_connections.find_one(
-                {"instagram_id": instagram_id, "is_active": True},
-                {"page_access_token": 1},
-                sort=[("last_updated", -1)]
-            )
-
-            logger.success(f"Retrieved IG Connection: {connection}")
+            # Look up the access token of the specific Instagram connection
+            access_token = await _get_page_token(instagram_id)
             
-            if connection and connection.get("page_access_token"):
+            if access_token:
                 # Use the connection-specific token and page ID
-                access_token = connection["page_access_token"]
                 # page_id = connection.get("page_id", instagram_id)
                 logger.info(f"Using Instagram-specific token for {instagram_id}")
             else:
@@ -99,12 +149,14 @@ async def send_ig_message(id, message_text, instagram_id, mode, org_id) -> dict:
             }
 
             # Send the message
-            response = requests.post(url, headers=headers, json=data)
-            logger.info(f"Instagram message response: {response.status_code}, {response.json()}")
+            response = await ig_http.post(url, headers=headers, json=data)
+            _check_token_rejected(response, instagram_id)
+            response_data = response.json()
+            logger.info(f"Instagram message response: {response.status_code}, {response_data}")
             
             # Return the response for further processing
-            sent_message_id = response.json().get("message_id")
-            return response.json()
+            sent_message_id = response_data.get("message_id")
+            return response_data
         else:
             message_id = f"privatenote_{uuid.uuid4()}"
 
@@ -157,17 +209,10 @@ async def send_ig_media_message(recipient, media_url, media_type, instagram_id,
         instagram_id: Instagram business account ID to use for sending
     """
     try:
-        connection = db.instagram_connections.find_one(
-            {"instagram_id": instagram_id, "is_active": True},
-            {"page_access_token": 1},
-            sort=[("last_updated", -1)]
-        )
-
-        logger.success(f"Retrieved IG Connection: {connection}")
+        access_token = await _get_page_token(instagram_id)
         
-        if connection and connection.get("page_access_token"):
+        if access_token:
             # Use the connection-specific token
-            access_token = connection["page_access_token"]
             logger.info(f"Using Instagram-specific token for {instagram_id}")
         else:
             # Fallback to default token if connection not found
@@ -199,11 +244,13 @@ async def send_ig_media_message(recipient, media_url, media_type, instagram_id,
             }
 
             # Send the media message
-            response = requests.post(url, headers=headers, json=data)
-            logger.info(f"Instagram media message response: {response.status_code}, {response.json()}")
+            response = await ig_http.post(url, headers=headers, json=data)
+            _check_token_rejected(response, instagram_id)
+            response_data = response.json()
+            logger.info(f"Instagram media message response: {response.status_code}, {response_data}")
             
             # Return the response for further processing
-            return response.json()
+            return response_data
         else:
             message_id = f"privatenote_{uuid.uuid4()}"
 
@@ -326,8 +373,11 @@ async def store_instagram_message(
     
     # Get Instagram-specific collections
     conversation_collection_name = f"conversations_{org_id}"
-    conversations_collection = db[conversation_collection_name]
-    messages_collection = db[f"messages_{org_id}"]
+    conversations_collection = async_db[conversation_collection_name]
+    messages_collection = async_db[f"messages_{org_id}"]
+    
+    # One timestamp for both the stored message and its broadcast
+    now = datetime.now(timezone.utc)
     
     # Create message object
     message = {
@@ -344,26 +394,19 @@ async def store_instagram_message(
         "sender_name": sender_name,
         "sender_username": sender_username,
         "role": role,
-        "timestamp": datetime.now(),
+        "timestamp": now,
         "status": "sent",
         "mode": mode
     }
     
     # Store message in Instagram-specific collection
-    messages_collection.insert_one(message)
+    await messages_collection.insert_one(message)
 
     logger.success(f"Instagram message stored: {message_id}")
     
-    # Keep only latest 500 messages per conversation
-    messages_count = messages_collection.count_documents({"conversation_id": conversation_id})
-    if messages_count > 500:
-        # Find and delete oldest message
-        oldest_message = messages_collection.find_one(
-            {"conversation_id": conversation_id},
-            sort=[("timestamp", 1)]  # 1 for ascending order
-        )
-        if oldest_message:
-            messages_collection.delete_one({"_id": oldest_message["_id"]})
+    # Keep roughly the latest MESSAGE_CAP messages per conversation (see _trim_conversation_messages)
+    if random.random() < MESSAGE_TRIM_SAMPLE_RATE:
+        await _trim_conversation_messages(messages_collection, conversation_id)
     
 
     # # Update message counter for the conversation
@@ -390,26 +433,14 @@ async def store_instagram_message(
         "context": context,
         "sender_id": sender_username,  # Use username for the frontend
         "role": role,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "status": "sent",
         "sender_name": sender_name,
         "mode": mode
     }
     
-    # Broadcast to /main-ws clients
-    await broadcast_main_ws(
-        platform_id=recipient_id,
-        platform_type="instagram",
-        event_type="new_message",
-        payload={"message": broadcast_message}
-    )
-    
-    # Broadcast to Instagram-specific WebSocket connections
-    if recipient_id in services.instagram_connections_map:
-        logger.info(f"Broadcasting message to Instagram user {recipient_id}")
-        await broadcast_instagram_message(recipient_id, "new_message", {
-            "message": broadcast_message
-        })
+    # Broadcast to /main-ws and Instagram-specific WebSocket clients without holding up the caller
+    schedule_instagram_event(recipient_id, "new_message", {"message": broadcast_message})
     
     # Check if counter >= 10 for conversational analytics
     # if conversation and conversation.get("message_counter", 0) >= 10:
@@ -425,6 +456,26 @@ async def store_instagram_message(
     
     return message_id
 
+async def _trim_conversation_messages(messages_collection, conversation_id: str):
+    """
+    Delete everything older than the newest MESSAGE_CAP messages of a conversation.
+    
+    Runs on a sample of inserts rather than every one, so the cap is soft (a conversation
+    can briefly exceed it by a few dozen messages) but the common case costs no round-trip.
+    One indexed skip on (conversation_id, timestamp) finds the cutoff; one delete_many
+    removes all the excess at once.
+    """
+    cutoff = await messages_collection.find_one(
+        {"conversation_id": conversation_id},
+        {"timestamp": 1},
+        sort=[("timestamp", -1)],
+        skip=MESSAGE_CAP
+    )
+    if cutoff:
+        await messages_collection.delete_many(
+            {"conversation_id": conversation_id, "timestamp": {"$lte": cutoff["timestamp"]}}
+        )
+
 async def create_or_update_instagram_conversation(org_id: str, 
                                                   recipient_id: str, 
                                                   sender_id: str, 
@@ -454,15 +505,48 @@ async def create_or_update_instagram_conversation(org_id: str,
     
     # Get the org-specific collection
     conversations_collection_name = f"conversations_{org_id}"
-    conversations_collection = db[conversations_collection_name]
+    conversations_collection = async_db[conversations_collection_name]
 
-    # Check if conversation already exists
-    existing_conversation = conversations_collection.find_one({"conversation_id": conversation_id})
+    # Existence check only decides whether to abort/reopen; the conversation itself
+    # is read back from the single upsert below
+    existing_conversation = await conversations_collection.find_one(
+        {"conversation_id": conversation_id},
+        {"_id": 1}
+    )
     
     convo_key = (org_id, conversation_id)
 
     is_being_viewed = len(services.convo_viewers.get(convo_key, set())) > 0
 
+    # Base fields that ALWAYS get updated (is_ai_enabled is never touched here)
+    update_set = {
+        "platform": "instagram",
+        "conversation_id": conversation_id,
+        "instagram_id": recipient_id,
+        "customer_id": sender_id,
+        "customer_name": customer_name,
+        "customer_username": username,
+        "last_message": last_message,
+        "last_message_timestamp": now,
+        "last_sender": last_sender,
+        "status": "open",
+        "last_message_is_private_note": mode == "private"
+    }
+
+    # Fields that ONLY get set if a NEW conversation is created
+    update_set_on_insert = {
+        "is_ai_enabled": False,
+        "started_at": now,
+        "created_at": now,
+        "closed_at": None
+    }
+
+    # Counters to increment atomically
+    update_inc = {
+        "message_counter": 1,
+        "unread_count": 0 if is_being_viewed else 1
+    }
+
     if existing_conversation:
         
         abort_result = await abort_scheduled_message(org_id, conversation_id)
@@ -471,72 +555,36 @@ async def create_or_update_instagram_conversation(org_id: str,
         reopen_result = await reopen_conversation(org_id, conversation_id)
         logger.success(f"Reopened conversation: {reopen_result}")
 
-        # Update existing conversation without modifying is_ai_enabled
-        ig_conversation = {
-            "platform": "instagram",
-            "conversation_id": conversation_id,
-            "instagram_id": recipient_id,
-            "customer_id": sender_id,
-            "customer_name": customer_name,
-            "customer_username": username,
-            "last_message": last_message,
-            "last_message_timestamp": now,
-            "last_sender": last_sender,
-            "status": "open",
-            "message_counter": existing_conversation.get("message_counter", 0) + 1,
-            "unread_count": existing_conversation.get("unread_count", 0) + (0 if is_being_viewed else 1),
-            "last_message_is_private_note": mode == "private"
-
-        }
-
         if last_sender == "customer":
             # Reset inactivity reminders on customer reply
-            ig_conversation["reminder_stage"] = 0
-            ig_conversation["next_action_at"] = None
+            update_set["reminder_stage"] = 0
+            update_set["next_action_at"] = None
 
         elif last_sender == "agent" and not is_auto_followup:
             # Manual agent message resets the inactivity countdown
-            ig_conversation["reminder_stage"] = 0
-            ig_conversation["next_action_at"] = now + timedelta(hours=6)
+            update_set["reminder_stage"] = 0
+            update_set["next_action_at"] = now + timedelta(hours=6)
 
     else:
-        # Create new conversation with is_ai_enabled set to True
-        ig_conversation = {
-            "platform": "instagram",
-            "conversation_id": conversation_id,
-            "instagram_id": recipient_id,
-            "customer_id": sender_id,
-            "customer_name": customer_name,
-            "customer_username": username,
-            "last_message": last_message,
-            "last_message_timestamp": now,
-            "unread_count": 1,
-            "is_ai_enabled": False,
-            "status": "open",
-            "last_sender": last_sender,
-            "started_at": now,
-            "created_at": now,
-            "reminder_stage": 0,
-            "next_action_at": now + timedelta(hours=6),
-            "closed_at": None,
-            "last_message_is_private_note": mode == "private"
-        }
+        update_set_on_insert["reminder_stage"] = 0
+        update_set_on_insert["next_action_at"] = now + timedelta(hours=6)
 
-    
     if last_sender == "customer":
-        ig_conversation["reply_window_ends_at"] = now + timedelta(hours=24)
+        update_set["reply_window_ends_at"] = now + timedelta(hours=24)
  
-    # Use $set to update only specified fields
-    conversations_collection.update_one(
+    # Upsert and read back the resulting document in one round-trip
+    updated_conversation = await conversations_collection.find_one_and_update(
         {"conversation_id": conversation_id},
-        {"$set": ig_conversation},
-        upsert=True
+        {
+            "$set": update_set,
+            "$setOnInsert": update_set_on_insert,
+            "$inc": update_inc
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER
     )
 
-    logger.success(f"Conversation updated: {ig_conversation}")
-    
-    # Get the updated conversation for broadcasting
-    updated_conversation = conversations_collection.find_one({"conversation_id": conversation_id})
+    logger.success(f"Conversation updated: {updated_conversation}")
     
     # Format the timestamp for JSON serialization
     broadcast_conversation = dict(updated_conversation)
@@ -551,25 +599,66 @@ async def create_or_update_instagram_conversation(org_id: str,
     if "_id" in broadcast_conversation:
         broadcast_conversation["_id"] = str(broadcast_conversation["_id"])
 
-    await broadcast_main_ws(
-        platform_id=recipient_id,
-        platform_type="instagram",
-        event_type="conversation_updated",
-        payload={"conversation": broadcast_conversation}
-    )
-
-    # Broadcast to Instagram-specific connections
-    if recipient_id in services.instagram_connections_map:
-            
-        await broadcast_instagram_message(recipient_id, "conversation_updated", {
-            "conversation": broadcast_conversation
-        })
+    schedule_instagram_event(recipient_id, "conversation_updated", {"conversation": broadcast_conversation})
         
     # Broadcast stats update for every message to ensure live dashboard refresh
     # await broadcast_on_stats_update(org_id)
         
     return conversation_id
 
+async def broadcast_instagram_event(instagram_id: str, event_type: str, payload: dict):
+    """
+    Send an event to /main-ws clients and Instagram-specific connections concurrently.
+    A failure on one side is logged and doesn't stop the other.
+    """
+    broadcasts = [
+        broadcast_main_ws(
+            platform_id=instagram_id,
+            platform_type="instagram",
+            event_type=event_type,
+            payload=payload
+        )
+    ]
+    if instagram_id in services.instagram_connections_map:
+        logger.info(f"Broadcasting {event_type} event to Instagram connections for {instagram_id}")
+        broadcasts.append(broadcast_instagram_message(instagram_id, event_type, payload))
+
+    for result in await asyncio.gather(*broadcasts, return_exceptions=True):
+        if isinstance(result, Exception):
+            logger.error(f"Error broadcasting Instagram {event_type} event for {instagram_id}: {result}")
+
+def schedule_instagram_event(instagram_id: str, event_type: str, payload: dict):
+    """
+    Run broadcast_instagram_event in the background so the request path returns
+    without waiting on the WebSocket fan-out. broadcast_instagram_event logs its own
+    failures, so nothing is lost by not awaiting it.
+    """
+    task = asyncio.create_task(broadcast_instagram_event(instagram_id, event_type, payload))
+    _BG_TASKS.add(task)
+    task.add_done_callback(_BG_TASKS.discard)
+
+def _json_sanitize(obj):
+    """
+    Make a broadcast payload JSON-safe in a single pass: datetimes become ISO strings,
+    ObjectIds become str, and any other non-JSON value becomes None.
+    """
+    if isinstance(obj, dict):
+        return {key: _json_sanitize(value) for key, value in obj.items()}
+
+    if isinstance(obj, (list, tuple)):
+        return [_json_sanitize(item) for item in obj]
+
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+
+    if isinstance(obj, ObjectId):
+        return str(obj)
+
+    return None
+
 # Add a new broadcast method for Instagram notifications
 async def broadcast_instagram_message(instagram_id: str, message_type: str, data: dict):
     """
@@ -584,22 +673,35 @@ async def broadcast_instagram_message(instagram_id: str, message_type: str, data
     if instagram_id in services.instagram_connections_map and services.instagram_connections_map[instagram_id]:
         disconnected_clients = []
         
-        # Convert any datetime objects in the data to ISO format strings
-        serializable_data = json.loads(json.dumps(data, default=lambda obj: obj.isoformat() if isinstance(obj, datetime) else str(obj) if isinstance(obj, ObjectId) else None))
+        # Convert any datetime / ObjectId values in the data to strings
+        serializable_data = _json_sanitize(data)
         
-        # Send to all Instagram-specific connections
-        for connection_key in services.instagram_connections_map[instagram_id]:
-            try:
-                if connection_key in manager.active_connections:
-                    await manager.active_connections[connection_key].send_json({
-                        "type": message_type,
-                        "platform": "instagram",
-                        **serializable_data
-                    })
-                    logger.success(f"Instagram notification sent to {connection_key}: {message_type}")
-            except Exception as e:
-                logger.error(f"Error notifying Instagram connection {connection_key}: {e}")
+        message = {
+            "type": message_type,
+            "platform": "instagram",
+            **serializable_data
+        }
+        
+        # Encode once for every recipient instead of one send_json encode per socket
+        message_text = orjson.dumps(message).decode()
+        
+        # Send to all Instagram-specific connections concurrently, so one slow socket
+        # doesn't hold up the rest
+        recipients = [
+            (connection_key, manager.active_connections[connection_key])
+            for connection_key in services.instagram_connections_map[instagram_id]
+            if connection_key in manager.active_connections
+        ]
+        results = await asyncio.gather(
+            *[websocket.send_text(message_text) for _, websocket in recipients],
+            return_exceptions=True
+        )
+        for (connection_key, _), result in zip(recipients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error notifying Instagram connection {connection_key}: {result}")
                 disconnected_clients.append(connection_key)
+            else:
+                logger.success(f"Instagram notification sent to {connection_key}: {message_type}")
         
         # Clean up disconnected clients
         for client_id in disconnected_clients:
@@ -610,7 +712,16 @@ async def broadcast_instagram_message(instagram_id: str, message_type: str, data
                 if not services.instagram_connections_map[instagram_id]:
                     del services.instagram_connections_map[instagram_id]
 
+# Instagram profile lookups by user ID. Usernames / names / pictures rarely change within
+# a conversation, so successful Graph responses are reused for an hour.
+_ig_profile_cache = TTLCache(maxsize=10000, ttl=3600)
+_ig_profile_picture_cache = TTLCache(maxsize=10000, ttl=3600)
+
 async def get_ig_username(sender_id, page_access_token):
+    cached = _ig_profile_cache.get(sender_id)
+    if cached is not None:
+        return dict(cached)
+
     if page_access_token == None:
         page_access_token = IG_ACCESS_TOKEN
     url = f"https://graph.instagram.com/{sender_id}"
@@ -622,9 +733,12 @@ async def get_ig_username(sender_id, page_access_token):
         "access_token" : page_access_token
     }
 
-    response = requests.get(url, headers=headers, params=params)
-    logger.info(f"Response: {response.status_code}, {response.json()}")
+    response = await ig_http.get(url, headers=headers, params=params)
+    status_code = response.status_code
     response = response.json()
+    logger.info(f"Response: {status_code}, {response}")
+    if "username" in response:
+        _ig_profile_cache[sender_id] = dict(response)
     return response
 
 async def get_ig_media_owner(media_id, page_access_token):
@@ -632,18 +746,23 @@ async def get_ig_media_owner(media_id, page_access_token):
     headers = {
         "Content-Type" : "application/json"
     }
+    # Expand the owner's profile picture in the same request instead of a second lookup
     params = {
-        "fields" : "username, owner",
+        "fields" : "username,owner{id,profile_picture_url}",
         "access_token" : page_access_token
     }
 
-    response = requests.get(url, headers=headers, params=params)
+    response = await ig_http.get(url, headers=headers, params=params)
     response = response.json()
-    if 'username' in response:
-        owner_username = response['username']
+    owner_username = response.get('username')
     if 'owner' in response:
-        owner_id = response['owner']['id']
-        profile_picture_url = await get_ig_profile_picture(owner_id, page_access_token)
+        owner = response['owner']
+        profile_picture_url = owner.get('profile_picture_url')
+        if profile_picture_url:
+            _ig_profile_picture_cache[owner['id']] = profile_picture_url
+        else:
+            # Expansion not returned for this owner; fall back to a direct lookup
+            profile_picture_url = await get_ig_profile_picture(owner['id'], page_access_token)
         return {
             "username": owner_username,
             "profile_picture_url": profile_picture_url
@@ -654,6 +773,10 @@ async def get_ig_media_owner(media_id, page_access_token):
     }
 
 async def get_ig_profile_picture(user_id, page_access_token):
+    cached = _ig_profile_picture_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     url = f"https://graph.instagram.com/{user_id}"
     headers = {
         "Content-Type" : "application/json"
@@ -663,9 +786,10 @@ async def get_ig_profile_picture(user_id, page_access_token):
         "access_token" : page_access_token
     }
 
-    response = requests.get(url, headers=headers, params=params)
+    response = await ig_http.get(url, headers=headers, params=params)
     response = response.json()
     if 'profile_picture_url' in response:
+        _ig_profile_picture_cache[user_id] = response['profile_picture_url']
         return response['profile_picture_url']
     return None
 
@@ -690,19 +814,28 @@ def fetch_media_data():
         logger.error(f"Error fetching data from Supabase: {e}")
         return {}
 
-media_data = fetch_media_data()
+# Keyword-reply config per post, loaded at import and refreshed at most every
+# MEDIA_DATA_TTL_SECONDS so edits in Supabase show up without a restart
+MEDIA_DATA_TTL_SECONDS = 60
+_media_data_cache: tuple[float, dict] = (time.monotonic(), fetch_media_data())
+_media_data_lock = asyncio.Lock()
+
+async def get_media_data() -> dict:
+    """Cached fetch_media_data(); a stale cache is refreshed off the event loop."""
+    global _media_data_cache
+    if time.monotonic() - _media_data_cache[0] < MEDIA_DATA_TTL_SECONDS:
+        return _media_data_cache[1]
+
+    async with _media_data_lock:
+        # Another caller may have refreshed it while we waited
+        if time.monotonic() - _media_data_cache[0] >= MEDIA_DATA_TTL_SECONDS:
+            _media_data_cache = (time.monotonic(), await asyncio.to_thread(fetch_media_data))
+    return _media_data_cache[1]
 
 # ============================================================================
 # INSTAGRAM COMMENT AUTOMATION FUNCTIONS
 # ============================================================================
 
-import httpx
-from database import get_mongo_db
-
-
-db = get_mongo_db()
-
-
 
 async def reply_to_comment(comment_id: str, reply_text: str, ig_account_id: str) -> bool:
     """
@@ -718,18 +851,10 @@ async def reply_to_comment(comment_id: str, reply_text: str, ig_account_id: str)
     """
     try:
         # Get page access token
-        connection = db.instagram_connections.find_one(
-            {"instagram_id": ig_account_id, "is_active": True}
-        )
-        
-        if not connection:
-            logger.error(f"No Instagram connection found for {ig_account_id}")
-            return False
-        
-        page_access_token = connection.get("page_access_token")
+        page_access_token = await _get_page_token(ig_account_id)
         
         if not page_access_token:
-            logger.error("No page access token found")
+            logger.error(f"No page access token found for Instagram connection {ig_account_id}")
             return False
         
         # Instagram Graph API v22.0 - Reply to comment
@@ -740,17 +865,17 @@ async def reply_to_comment(comment_id: str, reply_text: str, ig_account_id: str)
             "access_token": page_access_token
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, params=params)
-            
-            if response.status_code == 200:
-                result = response.json()
-                logger.success(f"✅ Comment reply sent: {result.get('id')}")
-                return True
-            else:
-                error_data = response.json()
-                logger.error(f"❌ Failed to reply to comment: {error_data}")
-                return False
+        response = await ig_http.post(url, params=params)
+        _check_token_rejected(response, ig_account_id)
+        
+        if response.status_code == 200:
+            result = response.json()
+            logger.success(f"✅ Comment reply sent: {result.get('id')}")
+            return True
+        else:
+            error_data = response.json()
+            logger.error(f"❌ Failed to reply to comment: {error_data}")
+            return False
     
     except Exception as e:
         logger.error(f"❌ Error replying to comment: {str(e)}")
@@ -779,18 +904,10 @@ async def send_private_reply(
     """
     try:
         # Get page access token
-        connection = db.instagram_connections.find_one(
-            {"instagram_id": ig_account_id, "is_active": True}
-        )
-        
-        if not connection:
-            logger.error(f"No Instagram connection found for {ig_account_id}")
-            return False
-        
-        page_access_token = connection.get("page_access_token")
+        page_access_token = await _get_page_token(ig_account_id)
         
         if not page_access_token:
-            logger.error("No page access token found")
+            logger.error(f"No page access token found for Instagram connection {ig_account_id}")
             return False
         
         # Step 1: Get commenter ID from comment
@@ -800,68 +917,68 @@ async def send_private_reply(
             "access_token": page_access_token
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            comment_response = await client.get(comment_url, params=comment_params)
-            
-            if comment_response.status_code != 200:
-                logger.error(f"Failed to fetch comment: {comment_response.text}")
-                return False
-            
-            comment_data = comment_response.json()
-            commenter_id = comment_data.get("from", {}).get("id")
-            
-            if not commenter_id:
-                logger.error("Could not extract commenter ID")
-                return False
-            
-            logger.info(f"Sending DM to commenter: {commenter_id}")
-            
-            # Step 2: Send DM
-            message_url = f"https://graph.instagram.com/v22.0/me/messages"
-            
-            # Build message payload
-            message_payload = {
-                "recipient": {"id": commenter_id},
-                "message": {},
-                "access_token": page_access_token
-            }
-            
-            # Add message content
-            if link_url:
-                # Send with link button
-                message_payload["message"] = {
-                    "attachment": {
-                        "type": "template",
-                        "payload": {
-                            "template_type": "generic",
-                            "elements": [{
-                                "title": message_text[:80],
-                                "buttons": [{
-                                    "type": "web_url",
-                                    "url": link_url,
-                                    "title": button_title or "View Link"
-                                }]
+        comment_response = await ig_http.get(comment_url, params=comment_params)
+        _check_token_rejected(comment_response, ig_account_id)
+        
+        if comment_response.status_code != 200:
+            logger.error(f"Failed to fetch comment: {comment_response.text}")
+            return False
+        
+        comment_data = comment_response.json()
+        commenter_id = comment_data.get("from", {}).get("id")
+        
+        if not commenter_id:
+            logger.error("Could not extract commenter ID")
+            return False
+        
+        logger.info(f"Sending DM to commenter: {commenter_id}")
+        
+        # Step 2: Send DM
+        message_url = f"https://graph.instagram.com/v22.0/me/messages"
+        
+        # Build message payload
+        message_payload = {
+            "recipient": {"id": commenter_id},
+            "message": {},
+            "access_token": page_access_token
+        }
+        
+        # Add message content
+        if link_url:
+            # Send with link button
+            message_payload["message"] = {
+                "attachment": {
+                    "type": "template",
+                    "payload": {
+                        "template_type": "generic",
+                        "elements": [{
+                            "title": message_text[:80],
+                            "buttons": [{
+                                "type": "web_url",
+                                "url": link_url,
+                                "title": button_title or "View Link"
                             }]
-                        }
+                        }]
                     }
                 }
-            else:
-                # Send text-only message
-                message_payload["message"] = {
-                    "text": message_text
-                }
-            
-            # Send DM
-            dm_response = await client.post(message_url, json=message_payload)
-            
-            if dm_response.status_code == 200:
-                result = dm_response.json()
-                logger.success(f"✅ DM sent: {result.get('message_id')}")
-                return True
-            else:
-                error_data = dm_response.json()
-                logger.error(f"❌ Failed to send DM: {error_data}")
-                return False
+            }
+        else:
+            # Send text-only message
+            message_payload["message"] = {
+                "text": message_text
+            }
+        
+        # Send DM
+        dm_response = await ig_http.post(message_url, json=message_payload)
+        
+        if dm_response.status_code == 200:
+            result = dm_response.json()
+            logger.success(f"✅ DM sent: {result.get('message_id')}")
+            return True
+        else:
+            error_data = dm_response.json()
+            logger.error(f"❌ Failed to send DM: {error_data}")
+            return False
     
     except Exception as e:
         logger.error(f"❌ Error sending DM: {str(e)}")
@@ -887,7 +1004,7 @@ async def revoke_instagram_access(org_id: str, user_id: str):
         access_token = connection.get("page_access_token")
         if access_token:
             try:
-                response = requests.delete(
+                response = await ig_http.delete(
                     f"https://graph.instagram.com/{user_id}/permissions",
                     params={"access_token": access_token}
                 )
@@ -1026,6 +1143,10 @@ async def remove_instagram_connection(org_id: str, instagram_id: str):
             {"$set": {"ig_id": None}}
         )
 
+        from services.common_service import invalidate_org_platform_ids
+        invalidate_org_platform_ids(org_id)
+        invalidate_page_token(instagram_id)
+
         if org_update_result.modified_count:
             logger.success(f"Cleared ig_id for organization {org_id}")
         else:
@@ -1080,7 +1201,7 @@ async def send_instagram_reaction(org_id, message_id, emoji):
             "fields": "name,profile_picture_url,username"
         }
         
-        response = requests.get(url, params=params)
+        response = await ig_http.get(url, params=params)
         
         if response.status_code != 200:
             logger.error(f"Instagram API Error: {response.text}")
@@ -1110,19 +1231,8 @@ async def send_instagram_reaction(org_id, message_id, emoji):
                 if "_id" in broadcast_message:
                     broadcast_message["_id"] = str(broadcast_message["_id"])
 
-                await broadcast_main_ws(
-                    platform_id=instagram_id,
-                    platform_type="instagram",
-                    event_type="message_reaction",
-                    payload={"message": broadcast_message}
-                )
-
                 # Broadcast the reaction update to connected clients
-                if instagram_id in services.instagram_connections_map:
-                    logger.info(f"Broadcasting message_reaction event to Frontend for {instagram_id}")
-                    await broadcast_instagram_message(instagram_id, "message_reaction", {
-                        "message": broadcast_message
-                    })
+                await broadcast_instagram_event(instagram_id, "message_reaction", {"message": broadcast_message})
 
                 logger.success(f"Reaction removed for message {message_id} with emoji ❤️")
 
@@ -1152,19 +1262,8 @@ async def send_instagram_reaction(org_id, message_id, emoji):
         if "_id" in broadcast_message:
             broadcast_message["_id"] = str(broadcast_message["_id"])
 
-        await broadcast_main_ws(
-            platform_id=instagram_id,
-            platform_type="instagram",
-            event_type="message_reaction",
-            payload={"message": broadcast_message}
-        )
-
         # Broadcast the reaction update to connected clients
-        if instagram_id in services.instagram_connections_map:
-            logger.info(f"Broadcasting message_reaction event to Frontend for {instagram_id}")
-            await broadcast_instagram_message(instagram_id, "message_reaction", {
-                "message": broadcast_message
-            })
+        await broadcast_instagram_event(instagram_id, "message_reaction", {"message": broadcast_message})
 
         logger.success(f"Reaction updated for message {message_id} with emoji ❤️")
         return {"status": "success", "message": "sent"}
@@ -1199,7 +1298,7 @@ async def send_message_reaction(message_id: str, instagram_id: str, page_access_
             }
         }
 
-        response = requests.post(url, headers=headers, json=body)
+        response = await ig_http.post(url, headers=headers, json=body)
         if response.status_code != 200:
             logger.error(f"Error sending message reaction: {response.text}")
             return "error"
@@ -1397,29 +1496,24 @@ async def get_comment_details(comment_id: str, ig_account_id: str) -> dict:
         Comment data dictionary
     """
     try:
-        connection = db.instagram_connections.find_one(
-            {"instagram_id": ig_account_id, "is_active": True}
-        )
+        page_access_token = await _get_page_token(ig_account_id)
         
-        if not connection:
+        if not page_access_token:
             return {}
         
-        page_access_token = connection.get("page_access_token")
-        
         url = f"https://graph.instagram.com/v22.0/{comment_id}"
         params = {
             "fields": "id,text,from,timestamp,media",
             "access_token": page_access_token
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to fetch comment: {response.text}")
-                return {}
+        response = await ig_http.get(url, params=params)
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.error(f"Failed to fetch comment: {response.text}")
+            return {}
     
     except Exception as e:
         logger.error(f"Error fetching comment details: {str(e)}")
@@ -1522,7 +1616,7 @@ async def process_comments_events(value: dict, ig_account_id: str, background_ta
         )
 
         #  Legacy keyword matching logic (Supabase)
-        media_info = media_data.get(str(post_id))
+        media_info = (await get_media_data()).get(str(post_id))
         if media_info and media_info['keyword'].lower() in comment_text.lower():
             # Initialize responded users for this media if needed
             if str(post_id) not in services.responded_users_by_media:
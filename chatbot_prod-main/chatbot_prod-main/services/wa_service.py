@@ -948,6 +948,9 @@ async def remove_whatsapp_connection(org_id: str, wa_id: str):
             {"$set": {"wa_id": None}}
         )
 
+        from services.common_service import invalidate_org_platform_ids
+        invalidate_org_platform_ids(org_id)
+
         if org_update_result.modified_count:
             logger.success(f"Cleared wa_id for organization {org_id}")
         else: